@@ -5,9 +5,14 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
+import sys
+from pathlib import Path
 from bs4 import BeautifulSoup
 
-def scrape_with_selenium(url):
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.telemetry import StageTelemetry
+
+def scrape_with_selenium(url, tel):
     chrome_options = Options()
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--disable-gpu")
@@ -16,12 +21,13 @@ def scrape_with_selenium(url):
     chrome_options.add_argument("--window-size=1920,1080")
 
     driver = webdriver.Chrome(options=chrome_options)
-    driver.get(url)
+    with tel.timer("page_load"):
+        driver.get(url)
 
-    # Wait until dataset info has loaded (look for "ACRA" or "datasetId" in page source)
-    WebDriverWait(driver, 20).until(
-        lambda d: "datasetId" in d.page_source
-    )
+        # Wait until dataset info has loaded (look for "ACRA" or "datasetId" in page source)
+        WebDriverWait(driver, 20).until(
+            lambda d: "datasetId" in d.page_source
+        )
 
     # Optional: wait a bit more to ensure all data loads
     time.sleep(5)
@@ -31,8 +37,10 @@ def scrape_with_selenium(url):
         f.write(html_content)
 
     driver.quit()
+    tel.item()
     print("✅ Saved full rendered page with dataset JSON")
 
 # Usage
 if __name__ == "__main__":
-    scrape_with_selenium("https://data.gov.sg/collections/2/view")
+    with StageTelemetry("acra_gov_page") as tel:
+        scrape_with_selenium("https://data.gov.sg/collections/2/view", tel)
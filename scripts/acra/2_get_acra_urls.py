@@ -1,26 +1,36 @@
 import re
 import json
+import sys
+from pathlib import Path
 
-with open("data/bronze/acra/html/rendered_acra_gov.html", "r", encoding="utf-8") as f:
-    html = f.read()
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.telemetry import StageTelemetry
 
-# Match escaped-quote pattern like:
-# datasetId\":\"d_...\",\"name\":\"ACRA Information on Corporate Entities ('X')\"
-pattern = (
-    r'datasetId\\":\\\"(d_[a-f0-9]+)\\\",\\\"name\\\":\\\"ACRA Information on Corporate Entities \(\'([A-Z]|Others)\'\)'
-)
+with StageTelemetry("acra_dataset_ids") as tel:
+    with open("data/bronze/acra/html/rendered_acra_gov.html", "r", encoding="utf-8") as f:
+        html = f.read()
 
-matches = re.findall(pattern, html)
+    # Match escaped-quote pattern like:
+    # datasetId\":\"d_...\",\"name\":\"ACRA Information on Corporate Entities ('X')\"
+    pattern = (
+        r'datasetId\\":\\\"(d_[a-f0-9]+)\\\",\\\"name\\\":\\\"ACRA Information on Corporate Entities \(\'([A-Z]|Others)\'\)'
+    )
 
-dataset_map = {letter: dataset_id for dataset_id, letter in matches}
+    with tel.timer("parse"):
+        matches = re.findall(pattern, html)
 
-if dataset_map:
-    for letter, dataset_id in dataset_map.items():
-        print(f"{letter}: {dataset_id}")
-    print(f"\n✅ Extracted {len(dataset_map)} dataset IDs (A–Z + Others)")
-else:
-    print("❌ No dataset IDs found — try confirming the escape style again (but this one should match).")
+    dataset_map = {letter: dataset_id for dataset_id, letter in matches}
+    tel.item(len(dataset_map))
 
-# Save to file
-with open("data/bronze/acra/json/acra_dataset_ids.json", "w", encoding="utf-8") as f:
-    json.dump(dataset_map, f, indent=2)
+    if dataset_map:
+        for letter, dataset_id in dataset_map.items():
+            print(f"{letter}: {dataset_id}")
+        print(f"\n✅ Extracted {len(dataset_map)} dataset IDs (A–Z + Others)")
+    else:
+        tel.error("NoDatasetIds")
+        tel.mark_failed()
+        print("❌ No dataset IDs found — try confirming the escape style again (but this one should match).")
+
+    # Save to file
+    with open("data/bronze/acra/json/acra_dataset_ids.json", "w", encoding="utf-8") as f:
+        json.dump(dataset_map, f, indent=2)
@@ -1,6 +1,7 @@
 """
 ACRA Data Extractor
 Extracts company data from Singapore government data.gov.sg
+Stage telemetry (download/parse latency, errors, RSS) via common.telemetry
 """
 
 import requests
@@ -10,6 +11,11 @@ import time
 import json
 import glob
 import os
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.bronze_writer import write_bronze
+from common.telemetry import StageTelemetry
 
 # Configuration
 OUTPUT_DIR = Path("data/bronze/acra/stage")
@@ -45,48 +51,53 @@ def delete_csv_files(directory_path):
             print(f"❌ Error deleting {file_path}: {e}")
 
 
-def get_download_url(dataset_id):
+def get_download_url(dataset_id, tel):
     """Get S3 download URL from data.gov.sg API"""
     url = f"{API_BASE}/{dataset_id}/initiate-download"
     
     try:
-        response = requests.get(url, timeout=30)
+        with tel.timer("api_request"):
+            response = requests.get(url, timeout=30)
         if response.status_code in [200, 201]:
             data = response.json()
             if data.get('code') == 0:
                 return data['data']['url']
+        tel.error(f"HTTP{response.status_code}")
     except Exception as e:
+        tel.error(e)
         print(f"Error getting download URL: {e}")
     
     return None
 
 
-def download_dataset(letter, dataset_id):
+def download_dataset(letter, dataset_id, tel):
     """Download ACRA dataset for a specific letter"""
     print(f"Downloading dataset '{letter}'...")
     
     # Get download URL
-    download_url = get_download_url(dataset_id)
+    download_url = get_download_url(dataset_id, tel)
     if not download_url:
         print(f"Failed to get download URL for {letter}")
         return None
     
     # Download CSV
     try:
-        response = requests.get(download_url, timeout=300, stream=True)
-        response.raise_for_status()
-        
-        output_file = OUTPUT_DIR / f"stage_{letter}.csv"
-        with open(output_file, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        with tel.timer("download"):
+            response = requests.get(download_url, timeout=300, stream=True)
+            response.raise_for_status()
+            
+            output_file = OUTPUT_DIR / f"stage_{letter}.csv"
+            with open(output_file, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    if chunk:
+                        f.write(chunk)
         
         size_mb = output_file.stat().st_size / 1024 / 1024
         print(f"Downloaded {letter}: {size_mb:.1f}MB")
         return output_file
         
     except Exception as e:
+        tel.error(e)
         print(f"Download failed for {letter}: {e}")
         return None
 
@@ -120,7 +131,7 @@ def filter_data(df):
     return df
 
 
-def main():
+def main(tel):
     print("="*70)
     print("ACRA Data Extraction")
     print("="*70)
@@ -131,13 +142,15 @@ def main():
     
     for letter, dataset_id in DATASET_IDS.items():
         # Download
-        csv_file = download_dataset(letter, dataset_id)
+        csv_file = download_dataset(letter, dataset_id, tel)
         if not csv_file:
             continue
         
         # Load and filter
         try:
-            df = pd.read_csv(csv_file, low_memory=False)
+            with tel.timer("parse"):
+                df = pd.read_csv(csv_file, low_memory=False)
+            tel.item()
             
             if total == 0:
                 print(f"\nColumns found: {df.columns.tolist()[:10]}...")
@@ -154,6 +167,7 @@ def main():
                     break
                     
         except Exception as e:
+            tel.error(e)
             print(f"Error processing {letter}: {e}")
         
         time.sleep(2)  # Be nice to the API
@@ -169,7 +183,9 @@ def main():
     if len(final_df) > TARGET_RECORDS:
         final_df = final_df.head(TARGET_RECORDS)
     
-    final_df.to_csv(FINAL_OUTPUT, index=False)
+    # acra_data.csv is always kept: the planner and scrapers read it locally
+    write_bronze(final_df, "acra", FINAL_OUTPUT, write_csv=True)
+    tel.set(records=len(final_df))
     
     print("\n" + "="*70)
     print("SUMMARY")
@@ -192,4 +208,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with StageTelemetry("acra_extract") as tel:
+        main(tel)
@@ -0,0 +1,88 @@
+"""
+Benchmark: sequential whole-file uploads vs the chunked parallel upload engine
+Uses the filesystem stand-in (LocalBackend) with a simulated round-trip
+latency and per-connection bandwidth, so no Azure account is needed.
+Checks that every uploaded file is byte-identical to its source.
+
+Run from the project root:
+    python scripts/benchmarks/bench_adls_upload.py
+"""
+
+import filecmp
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.adls_upload import LocalBackend, UploadEngine
+
+FILE_SIZES_MB = [24, 12, 8, 4, 2, 1, 1, 0.5]   # roughly one bronze run
+LATENCY = 0.03                                # 30 ms per request
+BANDWIDTH = 20 * 1024 * 1024                  # 20 MiB/s per connection
+
+CONFIGS = [
+    # name, block size, block workers, file workers
+    ("Sequential, whole file (old)", None, 1, 1),
+    ("Chunked 4 MiB, 1 file at a time", 4, 4, 1),
+    ("Chunked 4 MiB, 4 files x 4 blocks", 4, 4, 4),
+    ("Chunked 8 MiB, 4 files x 8 blocks", 8, 8, 4),
+]
+
+
+def make_files(folder):
+    paths = []
+    for i, size_mb in enumerate(FILE_SIZES_MB):
+        path = os.path.join(folder, f"source_{i}.csv")
+        with open(path, "wb") as f:
+            f.write(os.urandom(int(size_mb * 1024 * 1024)))
+        paths.append(path)
+    return paths
+
+
+def run_config(paths, remote_root, block_mb, block_workers, file_workers):
+    backend = LocalBackend(remote_root, latency=LATENCY, bandwidth=BANDWIDTH)
+    block_size = block_mb * 1024 * 1024 if block_mb else max(os.path.getsize(p) for p in paths)
+    engine = UploadEngine(backend, block_size=block_size, block_workers=block_workers,
+                          file_workers=file_workers, verbose=False)
+    jobs = [(p, "bronze", f"bench/{os.path.basename(p)}") for p in paths]
+
+    start = time.perf_counter()
+    results = engine.upload_many(jobs)
+    elapsed = time.perf_counter() - start
+
+    identical = all(
+        r["ok"] and filecmp.cmp(r["local_path"], os.path.join(remote_root, "bronze", r["remote_path"]),
+                                shallow=False)
+        for r in results
+    )
+    return elapsed, identical
+
+
+def main():
+    print("=" * 60)
+    print("ADLS UPLOAD BENCHMARK (filesystem stand-in)")
+    print("=" * 60 + "\n")
+
+    work = tempfile.mkdtemp(prefix="bench_upload_")
+    try:
+        paths = make_files(work)
+        total_mb = sum(os.path.getsize(p) for p in paths) / 1024 / 1024
+        print(f"{len(paths)} files, {total_mb:.1f} MiB, {LATENCY * 1000:.0f} ms/request, "
+              f"{BANDWIDTH / 1024 / 1024:.0f} MiB/s per connection\n")
+
+        baseline = None
+        for i, (name, block_mb, block_workers, file_workers) in enumerate(CONFIGS):
+            remote_root = os.path.join(work, f"remote_{i}")
+            elapsed, identical = run_config(paths, remote_root, block_mb, block_workers, file_workers)
+            baseline = baseline or elapsed
+            print(f"  {name:36} {elapsed:6.2f}s  {total_mb / elapsed:6.1f} MiB/s  "
+                  f"{baseline / elapsed:4.1f}x  identical={identical}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: BeautifulSoup (html.parser) vs lxml single-pass parsing
+Runs both parsers on the saved companies.sg / SGX pages and prints the
+per-page time and speedup. Falls back to generated pages of the same
+shape when no saved page exists.
+
+Run from the project root:
+    python scripts/benchmarks/bench_html_parsing.py
+"""
+
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.html_parsing import extract_labels, parse_stock_table
+
+COMPANIES_SG_HTML = "data/bronze/companies_sg/html/sample_company.html"
+STOCKS_HTML = "data/bronze/stocks/html/sgx_stocks.html"
+ROUNDS = 20
+
+LABELS = [
+    "Entity Name",
+    "UEN",
+    "Registration Incorporation Date",
+    "Company Type Description",
+    "Entity Status Description",
+    "Entity Type Description",
+]
+
+
+# ---------- current implementations ----------
+
+def bs4_extract_labels(page_source):
+    soup = BeautifulSoup(page_source, "html.parser")
+    data = {}
+    for label in LABELS:
+        el = soup.find("span", string=re.compile(label, re.I))
+        val = el.find_next("label") if el else None
+        data[label] = val.get_text(strip=True) if val else None
+    return data
+
+
+def bs4_parse_stock_table(page_source):
+    soup = BeautifulSoup(page_source, "html.parser")
+    rows = soup.find("table", {"id": "main-table"}).find("tbody").find_all("tr")
+    stocks = []
+    for row in rows:
+        cells = row.find_all("td")
+        if len(cells) < 7:
+            continue
+        link = cells[1].find("a")
+        stocks.append({
+            "symbol": " ".join((link or cells[1]).text.split()),
+            "company_name": " ".join(cells[2].text.split()),
+            "market_cap": " ".join(cells[3].text.split()),
+            "stock_price": " ".join(cells[4].text.split()),
+            "percent_change": " ".join(cells[5].text.split()),
+            "revenue": " ".join(cells[6].text.split()),
+        })
+    return stocks
+
+
+# ---------- fixture pages ----------
+
+def filler(n):
+    return "".join(
+        f'<div class="card"><p>Related company {i}</p><a href="/business/{i}">link</a>'
+        f'<span class="muted">Updated {i} days ago</span></div>'
+        for i in range(n)
+    )
+
+
+def generated_companies_sg_page():
+    details = "".join(
+        f'<div class="row"><span>{label}</span><label>VALUE {i}</label></div>'
+        for i, label in enumerate(LABELS)
+    )
+    return (f"<html><head><title>Company</title></head><body><nav>{filler(50)}</nav>"
+            f"<h1>FOO PTE. LTD.</h1><div id='details'>{details}</div>"
+            f"<section>{filler(400)}</section></body></html>")
+
+
+def generated_stocks_page(n=650):
+    rows = "".join(
+        f"<tr><td>{i}</td><td><a href='/quote/sgx/S{i}/'>S{i}</a></td><td>Company {i} Ltd</td>"
+        f"<td>{i * 1.1:.2f}M</td><td>{i % 7 + 0.5:.3f}</td><td>-{i % 5 / 10:.2f}%</td><td>{i * 2.3:.1f}M</td></tr>"
+        for i in range(1, n + 1)
+    )
+    return (f"<html><body><nav>{filler(100)}</nav><table id='main-table'><thead><tr><th>No.</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table><footer>{filler(100)}</footer></body></html>")
+
+
+def load_page(path, fallback):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read(), path
+    return fallback(), "generated"
+
+
+def bench(fn, page, rounds=ROUNDS):
+    fn(page)  # warm-up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        out = fn(page)
+    return (time.perf_counter() - start) / rounds, out
+
+
+def report(name, source, page, old_fn, new_fn):
+    old_t, old_out = bench(old_fn, page)
+    new_t, new_out = bench(new_fn, page)
+    print(f"{name} ({source}, {len(page):,} chars)")
+    print(f"  BeautifulSoup html.parser: {old_t * 1000:8.2f} ms/page")
+    print(f"  lxml single pass:          {new_t * 1000:8.2f} ms/page")
+    print(f"  Speedup:                   {old_t / new_t:8.1f}x")
+    print(f"  Same output:               {old_out == new_out}")
+    print()
+
+
+def main():
+    print("=" * 60)
+    print("HTML PARSING BENCHMARK")
+    print("=" * 60 + "\n")
+
+    page, source = load_page(COMPANIES_SG_HTML, generated_companies_sg_page)
+    report("companies.sg details page", source, page,
+           bs4_extract_labels, lambda p: extract_labels(p, LABELS))
+
+    page, source = load_page(STOCKS_HTML, generated_stocks_page)
+    report("SGX listing page", source, page,
+           bs4_parse_stock_table, parse_stock_table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: chained regexp_replace cleanup vs the anchored numeric parser
+Replays the silver notebook's old safe_numeric_cast steps with pandas
+string ops and compares them with common.numeric (vectorized and per-value)
+on SGX-shaped values. Also lists the values the two disagree on.
+The vectorized path needs pyarrow.
+
+Run from the project root:
+    python scripts/benchmarks/bench_numeric_parser.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.numeric import parse_numeric, parse_numeric_series, pc
+
+ROWS = 200_000
+ROUNDS = 5
+
+EDGE_CASES = ["1.23B", "-1.57%", "S$32.4M", "10,240", "-", "", "1.2T", "US$-5K",
+              "12.5bn", "Mkt 3M", "3M5", "SGD 4.1B", "−2.1M", "n/a"]
+
+
+# ---------- current implementation (pandas replay of the Spark chain) ----------
+
+def chained_cleanup(series):
+    s = series.str.strip()
+    s = s.str.replace(",", "", regex=False)
+    s = s.str.replace("%", "", regex=False)
+    s = s.str.replace(r"(?i)[$€₹usd\s]", "", regex=True)
+    s = s.str.replace(r"(?i)k", "e3", regex=True)
+    s = s.str.replace(r"(?i)m", "e6", regex=True)
+    s = s.str.replace(r"(?i)b", "e9", regex=True)
+    s = s.where(~s.isin(["-", ""]))
+    return pd.to_numeric(s, errors="coerce")
+
+
+# ---------- fixture values ----------
+
+def generated_values(n=ROWS, seed=7):
+    rng = random.Random(seed)
+    makers = [
+        lambda: f"{rng.uniform(1, 999):.2f}{rng.choice('KMB')}",   # market cap / revenue
+        lambda: f"{rng.uniform(0.01, 60):.3f}",                     # price
+        lambda: f"{rng.uniform(-9, 9):.2f}%",                       # % change
+        lambda: f"S${rng.uniform(1, 99):.1f}M",
+        lambda: f"{rng.randint(1000, 999999):,}",
+        lambda: "-",
+    ]
+    return pd.Series([rng.choice(makers)() for _ in range(n)], dtype="object")
+
+
+def bench(fn, values, rounds=ROUNDS):
+    fn(values)  # warm-up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        out = fn(values)
+    return (time.perf_counter() - start) / rounds, out
+
+
+def main():
+    print("=" * 60)
+    print("NUMERIC PARSER BENCHMARK")
+    print("=" * 60 + "\n")
+
+    values = generated_values()
+    old_t, old_out = bench(chained_cleanup, values)
+    new_t, new_out = bench(parse_numeric_series, values)
+    loop_t, _ = bench(lambda s: s.map(parse_numeric), values)
+
+    print(f"{len(values):,} values")
+    print(f"  Chained regexp_replace (9 steps): {old_t * 1000:8.1f} ms")
+    engine = "Arrow" if pc is not None else "per value, no pyarrow"
+    print(f"  Anchored parser ({engine}):".ljust(36) + f"{new_t * 1000:8.1f} ms")
+    print(f"  Anchored parser, per value:       {loop_t * 1000:8.1f} ms")
+    print(f"  Speedup (vectorized vs chain):    {old_t / new_t:8.1f}x")
+    same = ((old_out - new_out).abs() <= 1e-9 * new_out.abs().fillna(1)) | (old_out.isna() & new_out.isna())
+    print(f"  Same result on generated values:  {same.all()}")
+    print()
+
+    print("Edge cases (chain → parser)")
+    edge = pd.Series(EDGE_CASES, dtype="object")
+    for raw, old, new in zip(EDGE_CASES, chained_cleanup(edge), parse_numeric_series(edge)):
+        flag = "" if (old == new) or (pd.isna(old) and pd.isna(new)) else "  ⬅️ differs"
+        print(f"  {raw!r:12} {old!s:>16} → {new!s:<16}{flag}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Replay: scrape planner across runs
+Plans, writes scraper outputs the way the scrapers do, and plans again in a
+scratch directory, checking that
+- a UEN scraped by RecordOwl (websites_recordowl_<ts>.csv) is not planned
+  again, also after upload_adls moved the output to archive/
+- a later failed page load does not erase the values of an earlier scrape
+- a gap or conflict is only planned again once ACRA changed or RECHECK_DAYS passed
+
+Run from the project root:
+    python scripts/benchmarks/replay_scrape_planner.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+import scrape_planner as planner
+
+ACRA = pd.DataFrame({
+    "uen": ["A1", "B2", "C3"],
+    "entity_name": ["Alpha", "Beta", "Gamma"],
+    "registration_incorporation_date": ["2001-01-01", "2002-02-02", ""],
+    "company_type_description": ["x", "y", "z"],
+    "entity_status_description": ["Live", "Live", "Live"],
+    "entity_type_description": ["LC", "LC", "LC"],
+    "primary_ssic_code": ["1", "2", "3"],
+    "secondary_ssic_code": ["", "", ""],
+})
+
+RECORDOWL_DIR = "data/bronze/recordowld"
+
+
+def plan(acra):
+    """{source: {uen: plan_reason}} for one planner run"""
+    acra.to_csv(planner.ACRA_CSV, index=False)
+    loaded = planner.load_acra()
+    planned = {}
+    for source, config in planner.SCRAPERS.items():
+        worklist = planner.plan_source(loaded, config)
+        planned[source] = dict(zip(worklist["uen"], worklist["plan_reason"]))
+    return planned
+
+
+def check(label, condition):
+    print(f"{'✅' if condition else '❌'} {label}")
+    return condition
+
+
+def replay():
+    acra = ACRA.copy()
+    results = []
+
+    first = plan(acra)
+    results.append(check("first run plans every UEN for RecordOwl", set(first["recordowl"]) == {"A1", "B2", "C3"}))
+
+    # RecordOwl run: A1 scraped, B2 failed (only key and name, as process_batch writes it)
+    pd.DataFrame([
+        {"uen": "A1", "company_name": "Alpha", "company_link": "l", "website": "alpha.sg",
+         "primary_ssic_code": "1", "secondary_ssic_code": "", "contact_number": "", "description": "d"},
+        {"uen": "B2", "company_name": "Beta", "company_link": ""},
+    ]).to_csv(f"{RECORDOWL_DIR}/websites_recordowl_20260101_010000.csv", index=False)
+    # companies.sg run: C3's page has no date either, A1's page disagrees with ACRA on the status
+    pd.DataFrame([
+        {"UEN": "C3", "Entity Name": "Gamma", "Registration Incorporation Date": "",
+         "Entity Status Description": "Live", "scraped_at": pd.Timestamp.now().isoformat(timespec="seconds")},
+        {"UEN": "A1", "Entity Name": "Alpha", "Registration Incorporation Date": "2001-01-01",
+         "Entity Status Description": "Struck Off", "scraped_at": pd.Timestamp.now().isoformat(timespec="seconds")},
+    ]).to_csv("data/bronze/companies_sg/companies_sg_data.csv", index=False)
+
+    second = plan(acra)
+    results.append(check("UEN scraped by RecordOwl is not planned in the next run", "A1" not in second["recordowl"]))
+    results.append(check("failed RecordOwl page load is retried", "B2" in second["recordowl"]))
+    results.append(check("unchanged gap and conflict are not re-planned", second["companies_sg"] == {}))
+
+    # upload_adls archives the output; the next RecordOwl run fails on A1
+    shutil.move(f"{RECORDOWL_DIR}/websites_recordowl_20260101_010000.csv", f"{RECORDOWL_DIR}/archive/")
+    pd.DataFrame([{"uen": "A1", "company_name": "Alpha", "company_link": ""}]).to_csv(
+        f"{RECORDOWL_DIR}/websites_recordowl_20260102_010000.csv", index=False)
+
+    third = plan(acra)
+    history = pd.read_csv(planner.SCRAPERS["recordowl"]["history"], dtype=str, keep_default_na=False)
+    results.append(check("archived RecordOwl output still counts", "A1" not in third["recordowl"]))
+    results.append(check("later failure keeps the scraped website",
+                         history.loc[history["uen"] == "A1", "website"].tolist() == ["alpha.sg"]))
+
+    acra.loc[acra["uen"] == "A1", "entity_status_description"] = "Struck Off Pending"
+    fourth = plan(acra)
+    results.append(check("conflict is re-planned once ACRA changed",
+                         fourth["companies_sg"] == {"A1": "conflict:Entity Status Description"}))
+
+    recheck_days, planner.RECHECK_DAYS = planner.RECHECK_DAYS, -1
+    try:
+        fifth = plan(acra)
+    finally:
+        planner.RECHECK_DAYS = recheck_days
+    results.append(check("gap is re-planned after RECHECK_DAYS", "C3" in fifth["companies_sg"]))
+    return all(results)
+
+
+def main():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            for folder in ["data/bronze/acra", f"{RECORDOWL_DIR}/archive", "data/bronze/companies_sg"]:
+                os.makedirs(folder, exist_ok=True)
+            ok = replay()
+        finally:
+            os.chdir(cwd)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
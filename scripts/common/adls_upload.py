@@ -0,0 +1,174 @@
+"""
+Chunked, parallel uploads to ADLS Gen2
+- One DataLakeServiceClient (and one HTTP connection pool) for all files
+- Files are streamed in BLOCK_SIZE blocks with append_data/flush_data,
+  never read whole into memory
+- Blocks of a file and whole files are uploaded concurrently
+- Every block is retried on its own with exponential backoff
+- LocalBackend writes to a folder instead, for tests and benchmarks
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+BLOCK_SIZE = 4 * 1024 * 1024   # 4 MiB per append_data call
+BLOCK_WORKERS = 4              # concurrent blocks per file
+FILE_WORKERS = 4               # concurrent files
+RETRIES = 4
+
+
+class AdlsBackend:
+    """ADLS Gen2 through a single shared service client"""
+
+    def __init__(self, account_url, credential, pool_size=FILE_WORKERS * BLOCK_WORKERS):
+        import requests
+        from azure.core.pipeline.transport import RequestsTransport
+        from azure.storage.filedatalake import DataLakeServiceClient
+
+        # Size the connection pool for every block that can be in flight
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        self.service_client = DataLakeServiceClient(
+            account_url=account_url,
+            credential=credential,
+            transport=RequestsTransport(session=session, session_owner=False),
+        )
+        self.fs_clients = {}
+        self.lock = threading.Lock()
+
+    def _file_client(self, file_system, remote_path):
+        with self.lock:
+            if file_system not in self.fs_clients:
+                self.fs_clients[file_system] = self.service_client.get_file_system_client(file_system)
+        return self.fs_clients[file_system].get_file_client(remote_path)
+
+    def create(self, file_system, remote_path):
+        self._file_client(file_system, remote_path).create_file()
+
+    def append(self, file_system, remote_path, data, offset):
+        self._file_client(file_system, remote_path).append_data(data, offset=offset, length=len(data))
+
+    def flush(self, file_system, remote_path, length):
+        self._file_client(file_system, remote_path).flush_data(length)
+
+
+class LocalBackend:
+    """
+    Filesystem stand-in for ADLS: root/<file_system>/<remote_path>.
+
+    latency adds a fixed delay to every call and bandwidth (bytes/sec per call)
+    a size-based one, to mimic network round trips and per-connection throughput.
+    """
+
+    def __init__(self, root, latency=0.0, bandwidth=None):
+        self.root = root
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+    def _path(self, file_system, remote_path):
+        return os.path.join(self.root, file_system, remote_path)
+
+    def create(self, file_system, remote_path):
+        time.sleep(self.latency)
+        path = self._path(file_system, remote_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path + ".uploading", "wb").close()
+
+    def append(self, file_system, remote_path, data, offset):
+        time.sleep(self.latency + (len(data) / self.bandwidth if self.bandwidth else 0))
+        with open(self._path(file_system, remote_path) + ".uploading", "r+b") as f:
+            f.seek(offset)
+            f.write(data)
+
+    def flush(self, file_system, remote_path, length):
+        time.sleep(self.latency)
+        path = self._path(file_system, remote_path)
+        with open(path + ".uploading", "r+b") as f:
+            f.truncate(length)
+        os.replace(path + ".uploading", path)
+
+
+class UploadEngine:
+    """Uploads many local files through one backend"""
+
+    def __init__(self, backend, block_size=BLOCK_SIZE, block_workers=BLOCK_WORKERS,
+                 file_workers=FILE_WORKERS, retries=RETRIES, verbose=True):
+        self.backend = backend
+        self.block_size = block_size
+        self.block_workers = block_workers
+        self.file_workers = file_workers
+        self.retries = retries
+        self.verbose = verbose
+
+    def _retry(self, fn, *args):
+        for attempt in range(1, self.retries + 1):
+            try:
+                return fn(*args)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                delay = 0.5 * 2 ** (attempt - 1) + random.uniform(0, 0.25)
+                print(f"⚠️ {fn.__name__} failed ({type(e).__name__}: {e}), retry {attempt} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def upload_file(self, local_path, file_system, remote_path):
+        """Stream one file in blocks; at most block_workers blocks are in memory"""
+        size = os.path.getsize(local_path)
+        self._retry(self.backend.create, file_system, remote_path)
+
+        with open(local_path, "rb") as f, ThreadPoolExecutor(self.block_workers) as pool:
+            in_flight = set()
+            offset = 0
+            while True:
+                data = f.read(self.block_size)
+                if not data:
+                    break
+                in_flight.add(pool.submit(self._retry, self.backend.append,
+                                          file_system, remote_path, data, offset))
+                offset += len(data)
+                if len(in_flight) >= self.block_workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+            for future in in_flight:
+                future.result()
+
+        self._retry(self.backend.flush, file_system, remote_path, size)
+        return size
+
+    def upload_many(self, jobs, on_uploaded=None):
+        """
+        Upload (local_path, file_system, remote_path) jobs in parallel.
+
+        A failed file does not stop the others. on_uploaded(job) is called
+        from the worker thread right after each successful upload.
+
+        Returns:
+            list of dicts with local_path, remote_path, ok, bytes, seconds, error, error_class
+        """
+        def run(job):
+            local_path, file_system, remote_path = job
+            start = time.time()
+            try:
+                size = self.upload_file(local_path, file_system, remote_path)
+                if on_uploaded:
+                    on_uploaded(job)
+                if self.verbose:
+                    print(f"✅ Uploaded: {local_path} → {file_system}/{remote_path}")
+                return {"local_path": local_path, "remote_path": remote_path, "ok": True,
+                        "bytes": size, "seconds": time.time() - start, "error": None,
+                        "error_class": None}
+            except Exception as e:
+                print(f"❌ Failed: {local_path} ({type(e).__name__}: {e})")
+                return {"local_path": local_path, "remote_path": remote_path, "ok": False,
+                        "bytes": 0, "seconds": time.time() - start, "error": str(e),
+                        "error_class": type(e).__name__}
+
+        with ThreadPoolExecutor(self.file_workers) as pool:
+            return list(pool.map(run, jobs))
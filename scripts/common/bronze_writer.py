@@ -0,0 +1,171 @@
+"""
+Typed, compressed Parquet output for the bronze layer
+- One explicit Arrow schema per source (numbers, dates, booleans stay typed)
+- Parquet is written next to the CSV path (acra_data.csv -> acra_data.parquet)
+- The CSV is kept as an optional side output (BRONZE_WRITE_CSV), since the
+  local scrapers still read some of them (e.g. acra_data.csv)
+- csv_to_parquet() converts append-only CSVs chunk by chunk
+- Dates are parsed with an explicit format; values that do not match are
+  reported (count + samples) before they become null
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ==================== CONFIG ====================
+COMPRESSION = os.getenv("BRONZE_COMPRESSION", "zstd")          # zstd | snappy
+WRITE_CSV = os.getenv("BRONZE_WRITE_CSV", "1") == "1"           # CSV side output
+CHUNK_ROWS = 50_000
+DATE_FORMAT = "%Y-%m-%d"                 # ACRA dates
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"   # scraped_at (datetime.isoformat(timespec="seconds"))
+# =================================================
+
+BLANK_TOKENS = {"", "na", "n/a", "-", "nan", "none", "nat"}
+
+# Scraper column -> bronze column, where the silver config expects a different name
+COLUMN_RENAMES = {
+    "companies_sg": {"URL": "companies_sg_website"},
+}
+
+
+def _strings(*names):
+    return [(name, pa.string()) for name in names]
+
+
+SCHEMAS = {
+    "acra": pa.schema(
+        _strings("uen", "issuance_agency_id", "entity_name", "entity_type_description",
+                 "business_constitution_description", "company_type_description",
+                 "paf_constitution_description", "entity_status_description")
+        + [("registration_incorporation_date", pa.date32()), ("uen_issue_date", pa.date32())]
+        + _strings("address_type", "block", "street_name", "level_no", "unit_no",
+                   "building_name", "postal_code", "other_address_line1", "other_address_line2")
+        + [("account_due_date", pa.date32()), ("annual_return_date", pa.date32())]
+        + _strings("primary_ssic_code", "primary_ssic_description", "primary_user_described_activity",
+                   "secondary_ssic_code", "secondary_ssic_description",
+                   "secondary_user_described_activity")
+        + [("no_of_officers", pa.int32())]
+    ),
+    "recordowl": pa.schema(_strings(
+        "uen", "company_name", "company_link", "registration_number", "registered_address",
+        "operating_status", "company_age", "building", "contact_number", "website", "description",
+        "primary_ssic_code", "primary_industry", "secondary_ssic_code", "secondary_industry",
+        "company_founder", "facebook", "linkedin", "twitter", "instagram", "youtube", "tiktok",
+        "pinterest",
+    )),
+    "companies_sg": pa.schema(
+        _strings("Entity Name", "UEN", "Registration Incorporation Date", "Company Type Description",
+                 "Entity Status Description", "Entity Type Description", "companies_sg_website")
+        + [("scraped_at", pa.timestamp("s"))]
+    ),
+    "stocks": pa.schema(
+        _strings("symbol", "company_name")
+        + [("market_cap", pa.float64()), ("stock_price", pa.float64()),
+           ("percent_change", pa.float64()), ("revenue", pa.float64())]
+    ),
+    "scrape_websites": pa.schema(
+        _strings("uen", "company_name", "website", "linkedin", "facebook", "instagram",
+                 "contact_email", "contact_phone", "keywords", "scrape_status")
+        + [("html_saved", pa.bool_()), ("html_size", pa.int64())]
+        + _strings("error")
+        + [("scrape_time", pa.float64())]
+    ),
+}
+
+
+def parquet_path_for(csv_path):
+    return os.path.splitext(str(csv_path))[0] + ".parquet"
+
+
+def _parse_datetimes(series, fmt, name):
+    """Parse with an explicit format; non-blank values that do not match are reported, then null"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    text = series.map(lambda v: None if v is None or v != v else str(v).strip())
+    blank = text.isna() | text.str.lower().isin(BLANK_TOKENS)
+    parsed = pd.to_datetime(text.where(~blank), format=fmt, errors="coerce")
+    rejected = ~blank & parsed.isna()
+    if rejected.any():
+        samples = text[rejected].unique()[:5].tolist()
+        print(f"⚠️ {name}: {int(rejected.sum())} values do not match {fmt} and were set to null, e.g. {samples}")
+    return parsed
+
+
+def _coerce(series, dtype, name=""):
+    """Convert one pandas column to the schema type; bad values become null"""
+    if pa.types.is_string(dtype):
+        return series.map(lambda v: None if v is None or v != v or v == "" else str(v))
+    if pa.types.is_floating(dtype):
+        return pd.to_numeric(series, errors="coerce").astype("float64")
+    if pa.types.is_integer(dtype):
+        return pd.to_numeric(series, errors="coerce").astype("Int64")
+    if pa.types.is_boolean(dtype):
+        lowered = series.astype(str).str.strip().str.lower()
+        return lowered.map({"true": True, "1": True, "false": False, "0": False}).astype("boolean")
+    if pa.types.is_date32(dtype):
+        return _parse_datetimes(series, DATE_FORMAT, name).dt.date
+    if pa.types.is_timestamp(dtype):
+        return _parse_datetimes(series, TIMESTAMP_FORMAT, name)
+    raise TypeError(f"No coercion for {dtype}")
+
+
+def to_table(df, source):
+    """
+    Arrow table with exactly the source schema.
+
+    Scraper columns are renamed per COLUMN_RENAMES; missing columns become null;
+    columns not in the schema are dropped (and reported).
+    """
+    schema = SCHEMAS[source]
+    df = df.rename(columns=COLUMN_RENAMES.get(source, {}))
+    extra = [c for c in df.columns if c not in schema.names]
+    if extra:
+        print(f"⚠️ {source}: columns not in the bronze schema were dropped: {extra}")
+
+    columns = {}
+    for field in schema:
+        series = df[field.name] if field.name in df.columns else pd.Series([None] * len(df), dtype=object)
+        columns[field.name] = _coerce(series.reset_index(drop=True), field.type, f"{source}.{field.name}")
+    return pa.Table.from_pandas(pd.DataFrame(columns), schema=schema, preserve_index=False)
+
+
+def write_bronze(df, source, csv_path, write_csv=WRITE_CSV):
+    """
+    Write df as typed Parquet next to csv_path (and the CSV too if write_csv).
+
+    Returns:
+        path of the Parquet file
+    """
+    parquet_path = parquet_path_for(csv_path)
+    os.makedirs(os.path.dirname(parquet_path) or ".", exist_ok=True)
+
+    tmp_path = parquet_path + ".tmp"
+    pq.write_table(to_table(df, source), tmp_path, compression=COMPRESSION)
+    os.replace(tmp_path, parquet_path)
+
+    if write_csv:
+        df.to_csv(csv_path, index=False, encoding="utf-8")
+
+    print(f"🧱 Bronze Parquet ({COMPRESSION}): {parquet_path} "
+          f"({os.path.getsize(parquet_path):,} bytes, {len(df)} rows)")
+    return parquet_path
+
+
+def csv_to_parquet(csv_path, source):
+    """Convert an existing CSV (e.g. an append-only output) to Parquet in chunks"""
+    parquet_path = parquet_path_for(csv_path)
+    tmp_path = parquet_path + ".tmp"
+    rows = 0
+
+    with pq.ParquetWriter(tmp_path, SCHEMAS[source], compression=COMPRESSION) as writer:
+        for chunk in pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=CHUNK_ROWS):
+            writer.write_table(to_table(chunk, source))
+            rows += len(chunk)
+    os.replace(tmp_path, parquet_path)
+
+    print(f"🧱 Bronze Parquet ({COMPRESSION}): {parquet_path} "
+          f"({os.path.getsize(parquet_path):,} bytes, {rows} rows)")
+    return parquet_path
@@ -0,0 +1,97 @@
+"""
+Fast targeted HTML parsing with lxml
+- Each page is parsed once by lxml's C parser
+- All wanted labels are extracted in a single pass over <span>/<label> elements
+- The SGX listing table is read straight from #main-table rows
+"""
+
+from lxml import html as lxml_html
+
+
+def parse_html(page_source):
+    """Parse a page into an lxml tree"""
+    return lxml_html.fromstring(page_source)
+
+
+def clean_text(text):
+    """Collapse whitespace"""
+    if text:
+        return ' '.join(text.split())
+    return ''
+
+
+def extract_labels(page_source, labels):
+    """
+    Extract '<span>Label</span> ... <label>Value</label>' pairs in one traversal.
+
+    Matches the old BeautifulSoup lookup: the first <span> whose own text
+    contains the label (case-insensitive) gives the text of the next <label>
+    in document order. The walk stops as soon as every label has a value.
+
+    Returns:
+        dict {label: value or None}
+    """
+    root = parse_html(page_source) if isinstance(page_source, (str, bytes)) else page_source
+
+    wanted = {label: label.lower() for label in labels}
+    result = {label: None for label in labels}
+    found = set()
+    pending = []
+
+    for el in root.iter('span', 'label'):
+        if el.tag == 'label':
+            if pending:
+                value = el.text_content().strip()
+                for label in pending:
+                    result[label] = value
+                pending = []
+                if len(found) == len(wanted):
+                    break
+            continue
+
+        # only spans that hold plain text (same as soup.find(string=...))
+        if len(el) or not el.text:
+            continue
+        text = el.text.lower()
+        for label, needle in wanted.items():
+            if label not in found and needle in text:
+                found.add(label)
+                pending.append(label)
+
+    return result
+
+
+def parse_stock_table(page_source):
+    """
+    Extract rows from the stockanalysis.com #main-table
+
+    Returns:
+        list of dicts with symbol, company_name, market_cap, stock_price,
+        percent_change, revenue (None if the table is missing)
+    """
+    root = parse_html(page_source)
+
+    tables = root.xpath('//table[@id="main-table"]')
+    if not tables:
+        return None
+
+    stocks = []
+    for row in tables[0].iterfind('tbody/tr'):
+        cells = row.findall('td')
+        if len(cells) < 7:
+            continue
+
+        # Structure: No, Symbol, Company Name, Market Cap, Stock Price, % Change, Revenue
+        symbol_link = cells[1].find('.//a')
+        symbol_node = symbol_link if symbol_link is not None else cells[1]
+
+        stocks.append({
+            'symbol': clean_text(symbol_node.text_content()),
+            'company_name': clean_text(cells[2].text_content()),
+            'market_cap': clean_text(cells[3].text_content()),
+            'stock_price': clean_text(cells[4].text_content()),
+            'percent_change': clean_text(cells[5].text_content()),
+            'revenue': clean_text(cells[6].text_content()),
+        })
+
+    return stocks
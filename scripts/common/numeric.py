@@ -0,0 +1,87 @@
+"""
+Numeric parsing for display strings like '1.23B', '-1.57%', 'S$32.4M', '10,240', '-'
+- One anchored pattern: optional sign, optional currency, number, then either
+  an exponent or a K/M/B/T suffix at the very end, optional %
+- Suffixes become a decimal exponent ('4.1B' -> '4.1E9'), so values are exact
+- Anything that does not match the whole token becomes NaN (never a wrong number)
+- parse_numeric_series() runs the pattern with Arrow compute when pyarrow is
+  installed, otherwise value by value
+- The same pattern is used by the silver notebook's Spark expression
+"""
+
+import re
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+# Groups: 1 sign, 2 sign after currency, 3 mantissa, 4 exponent, 5 suffix
+_PATTERN_TEMPLATE = (
+    r"^({sign1}[-+−]?)\s*(?:S\$|US\$|SGD|USD|\$)?\s*({sign2}[-+−]?)"
+    r"({mantissa}\d[\d,]*(?:\.\d+)?|\.\d+)(?:({exponent}E[-+]?\d+)|\s*({suffix}[KMBT]))?\s*%?$"
+)
+NUMERIC_PATTERN = _PATTERN_TEMPLATE.format(sign1="", sign2="", mantissa="", exponent="", suffix="")
+NUMERIC_RE = re.compile(NUMERIC_PATTERN, re.IGNORECASE)
+_ARROW_PATTERN = _PATTERN_TEMPLATE.format(
+    sign1="?P<sign1>", sign2="?P<sign2>", mantissa="?P<mantissa>",
+    exponent="?P<exponent>", suffix="?P<suffix>",
+)
+
+SUFFIX_EXPONENTS = {"K": "E3", "M": "E6", "B": "E9", "T": "E12"}
+NEGATIVE_SIGNS = ["-", "−"]
+
+
+def parse_numeric(value):
+    """Parse one display string; returns float or None"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return None if value != value else float(value)
+
+    match = NUMERIC_RE.match(str(value).strip())
+    if not match:
+        return None
+    sign1, sign2, mantissa, exponent, suffix = match.groups()
+    exponent = exponent or SUFFIX_EXPONENTS.get((suffix or "").upper(), "")
+    number = float(mantissa.replace(",", "") + exponent)
+    return -number if (sign1 in NEGATIVE_SIGNS or sign2 in NEGATIVE_SIGNS) else number
+
+
+def _parse_arrow(series):
+    text = pc.utf8_upper(pc.utf8_trim_whitespace(pa.array(series.astype("string"), type=pa.string())))
+    parts = pc.extract_regex(text, _ARROW_PATTERN)
+
+    suffix = pc.struct_field(parts, "suffix")
+    for letter, exponent in SUFFIX_EXPONENTS.items():
+        suffix = pc.replace_substring(suffix, letter, exponent)
+    number = pc.binary_join_element_wise(
+        pc.replace_substring(pc.struct_field(parts, "mantissa"), ",", ""),
+        pc.struct_field(parts, "exponent"), suffix, "",
+    )
+    value = pc.cast(number, pa.float64())
+
+    negative = pc.or_(pc.is_in(pc.struct_field(parts, "sign1"), pa.array(NEGATIVE_SIGNS)),
+                      pc.is_in(pc.struct_field(parts, "sign2"), pa.array(NEGATIVE_SIGNS)))
+    value = pc.if_else(negative, pc.negate(value), value)
+    return pd.Series(value.to_numpy(zero_copy_only=False), index=series.index, dtype="float64")
+
+
+def parse_numeric_series(series):
+    """Parse a pandas Series into float64 (NaN where unparseable)"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype("float64")
+    if pc is not None:
+        return _parse_arrow(series)
+    return series.map(parse_numeric).astype("float64")
+
+
+def parse_numeric_columns(df, columns):
+    """Parse the given columns in place (columns that are missing are skipped)"""
+    for column in columns:
+        if column in df.columns:
+            df[column] = parse_numeric_series(df[column])
+    return df
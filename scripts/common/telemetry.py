@@ -0,0 +1,319 @@
+"""
+Per-stage performance telemetry for the bronze pipeline
+- StageTelemetry wraps one stage (a scraper run, a scheduler stage, ...)
+- Records start/end, items processed, items/sec, latency percentiles
+  (p50/p95/max per metric, e.g. page_load / parse), error counts by class,
+  peak RSS and peak Chrome process count of the process tree
+- Writes one JSON line per stage start/end to data/telemetry/telemetry.jsonl
+  and a Prometheus textfile (data/telemetry/<stage>.prom) for node_exporter
+- Resource sampling uses psutil when installed, else /proc (Linux); on other
+  systems without psutil only the own-process peak RSS is reported (if at all)
+- PIPELINE_RUN_ID (set by the scheduler) ties the stages of one run together
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:          # Windows
+    resource = None
+
+# ==================== CONFIG ====================
+TELEMETRY_DIR = os.getenv("TELEMETRY_DIR", "data/telemetry")
+JSONL_NAME = "telemetry.jsonl"
+SAMPLE_INTERVAL = float(os.getenv("TELEMETRY_SAMPLE_SEC", "5"))   # resource sampling
+CHROME_NAMES = ("chrome", "chromium", "chromedriver", "undetected_chromedriver")
+METRIC_PREFIX = "bronze_stage"
+# =================================================
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _is_chrome(name):
+    name = (name or "").lower()
+    return any(name.startswith(c) for c in CHROME_NAMES)
+
+
+# ---------- process tree sampling ----------
+
+def _sample_psutil(pid):
+    root = psutil.Process(pid)
+    procs = [root] + root.children(recursive=True)
+    rss, chrome = 0, 0
+    for proc in procs:
+        try:
+            rss += proc.memory_info().rss
+            chrome += _is_chrome(proc.name())
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return rss, chrome
+
+
+def _sample_proc(pid):
+    """(rss bytes, chrome processes) of pid and its descendants from /proc"""
+    parents, names = {}, {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # "pid (comm) state ppid ..."; comm may contain spaces
+        name = stat[stat.index("(") + 1:stat.rindex(")")]
+        parents[int(entry)] = int(stat[stat.rindex(")") + 2:].split()[1])
+        names[int(entry)] = name
+
+    tree, frontier = {pid}, [pid]
+    children = defaultdict(list)
+    for child, parent in parents.items():
+        children[parent].append(child)
+    while frontier:
+        for child in children.get(frontier.pop(), []):
+            if child not in tree:
+                tree.add(child)
+                frontier.append(child)
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    rss, chrome = 0, 0
+    for proc in tree:
+        try:
+            with open(f"/proc/{proc}/statm", encoding="utf-8") as f:
+                rss += int(f.read().split()[1]) * page_size
+        except OSError:
+            continue
+        chrome += _is_chrome(names.get(proc))
+    return rss, chrome
+
+
+def sample_process_tree(pid=None):
+    """
+    Current memory and Chrome usage of a process and its children.
+
+    Returns:
+        (rss_bytes, chrome_process_count), either may be None if unavailable
+    """
+    pid = pid or os.getpid()
+    try:
+        if psutil is not None:
+            return _sample_psutil(pid)
+        if os.path.isdir("/proc"):
+            return _sample_proc(pid)
+    except Exception:
+        pass
+    return None, None
+
+
+def _own_peak_rss():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024   # Linux reports KiB
+
+
+# ---------- stage telemetry ----------
+
+class StageTelemetry:
+    """
+    Usage:
+        with StageTelemetry("companies_sg") as tel:
+            for uen in uens:
+                with tel.timer("page_load"):
+                    driver.get(url)
+                with tel.timer("parse"):
+                    row = parse(driver.page_source)
+                tel.item()
+            ...
+            tel.error(exc)          # counted by exception class
+
+    The stage ends as "failed" if the block raises or mark_failed() was called.
+    """
+
+    def __init__(self, stage, output_dir=TELEMETRY_DIR, sample_interval=SAMPLE_INTERVAL, run_id=None):
+        self.stage = stage
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.run_id = run_id or os.getenv("PIPELINE_RUN_ID") or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.failed = False
+        self.items = 0
+        self.errors = Counter()
+        self.latencies = defaultdict(list)
+        self.extra = {}
+        self.peak_rss = None
+        self.peak_chrome = None
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self.started_at = None
+        self._start = None
+
+    # ---------- recording ----------
+    def item(self, count=1):
+        with self.lock:
+            self.items += count
+
+    def error(self, error):
+        """Count an error by class; accepts an exception, a class or a name"""
+        if isinstance(error, BaseException):
+            name = type(error).__name__
+        elif isinstance(error, type):
+            name = error.__name__
+        else:
+            name = str(error)
+        with self.lock:
+            self.errors[name] += 1
+
+    def observe(self, metric, seconds):
+        with self.lock:
+            self.latencies[metric].append(seconds)
+
+    @contextmanager
+    def timer(self, metric):
+        """Time a block as one latency sample (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(metric, time.perf_counter() - start)
+
+    def mark_failed(self):
+        """For stages that report failure without raising (e.g. a non-zero exit code)"""
+        self.failed = True
+
+    def set(self, **fields):
+        """Attach extra stage-level fields (e.g. rows=..., files=...) to the end record"""
+        self.extra.update(fields)
+
+    # ---------- resources ----------
+    def _sample(self):
+        rss, chrome = sample_process_tree()
+        with self.lock:
+            if rss is not None:
+                self.peak_rss = max(self.peak_rss or 0, rss)
+            if chrome is not None:
+                self.peak_chrome = max(self.peak_chrome or 0, chrome)
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_interval):
+            self._sample()
+
+    # ---------- lifecycle ----------
+    def __enter__(self):
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        try:
+            self._write_jsonl({"event": "stage_start"})
+        except OSError as e:
+            print(f"⚠️ Telemetry not written: {e}")
+        self._sample()
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._sampler.join(timeout=self.sample_interval)
+        self._sample()
+        if exc_type is not None and not issubclass(exc_type, KeyboardInterrupt):
+            self.error(exc_type)
+        summary = self.summary(status="failed" if exc_type or self.failed else "success")
+        try:
+            self._write_jsonl({"event": "stage_end", **summary})
+            self._write_prometheus(summary)
+        except OSError as e:
+            print(f"⚠️ Telemetry not written: {e}")
+        return False
+
+    def summary(self, status="running"):
+        duration = time.perf_counter() - self._start
+        with self.lock:
+            latency = {}
+            for metric, values in self.latencies.items():
+                ordered = sorted(values)
+                latency[metric] = {
+                    "count": len(ordered),
+                    "p50": round(percentile(ordered, 50), 4),
+                    "p95": round(percentile(ordered, 95), 4),
+                    "max": round(ordered[-1], 4),
+                }
+            peak_rss = self.peak_rss or _own_peak_rss()
+            return {
+                "status": status,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "duration_sec": round(duration, 3),
+                "items": self.items,
+                "items_per_sec": round(self.items / duration, 3) if duration > 0 else 0.0,
+                "latency": latency,
+                "errors": dict(self.errors),
+                "error_total": sum(self.errors.values()),
+                "peak_rss_mb": round(peak_rss / 1024 / 1024, 1) if peak_rss else None,
+                "peak_chrome_processes": self.peak_chrome,
+                **self.extra,
+            }
+
+    # ---------- output ----------
+    def _write_jsonl(self, record):
+        os.makedirs(self.output_dir, exist_ok=True)
+        line = {"ts": datetime.now().isoformat(timespec="seconds"), "run_id": self.run_id,
+                "stage": self.stage, "pid": os.getpid(), **record}
+        with open(os.path.join(self.output_dir, JSONL_NAME), "a", encoding="utf-8") as f:
+            f.write(json.dumps(line, default=str) + "\n")
+
+    def _write_prometheus(self, summary):
+        stage = self.stage.replace("\\", "\\\\").replace('"', '\\"')
+        label = f'stage="{stage}"'
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{METRIC_PREFIX}_{name}{{{labels}}} {value}")
+
+        metric("success", "gauge", "1 if the last run succeeded",
+               [(label, int(summary["status"] == "success"))])
+        metric("last_run_timestamp_seconds", "gauge", "End time of the last run",
+               [(label, int(time.time()))])
+        metric("duration_seconds", "gauge", "Wall time of the last run",
+               [(label, summary["duration_sec"])])
+        metric("items", "gauge", "Items processed in the last run", [(label, summary["items"])])
+        metric("items_per_second", "gauge", "Throughput of the last run",
+               [(label, summary["items_per_sec"])])
+        metric("latency_seconds", "gauge", "Latency quantiles of the last run",
+               [(f'{label},metric="{m}",quantile="{q}"', v[key])
+                for m, v in summary["latency"].items()
+                for q, key in (("0.5", "p50"), ("0.95", "p95"), ("1", "max"))])
+        metric("errors", "gauge", "Errors in the last run by class",
+               [(f'{label},error_class="{cls}"', n) for cls, n in summary["errors"].items()])
+        if summary["peak_rss_mb"] is not None:
+            metric("peak_rss_bytes", "gauge", "Peak RSS of the process tree",
+                   [(label, int(summary["peak_rss_mb"] * 1024 * 1024))])
+        if summary["peak_chrome_processes"] is not None:
+            metric("peak_chrome_processes", "gauge", "Peak Chrome/chromedriver processes",
+                   [(label, summary["peak_chrome_processes"])])
+
+        file_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.stage) + ".prom"
+        path = os.path.join(self.output_dir, file_name)
+        tmp = path + ".tmp"          # node_exporter must never see a half-written file
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
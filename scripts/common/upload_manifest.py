@@ -0,0 +1,65 @@
+"""
+Persistent upload manifest (SQLite)
+- One row per remote file: local path, size, SHA-256, remote path, upload time
+- A file whose content is already recorded for its remote path is not uploaded again
+- Rows are written as soon as each upload finishes, so a crash between
+  upload and archive resumes without re-uploading
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+HASH_CHUNK = 1024 * 1024
+
+
+def file_sha256(path):
+    """SHA-256 of a file, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class UploadManifest:
+    """Thread-safe manifest of what has been shipped where"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS uploads (
+                    file_system  TEXT NOT NULL,
+                    remote_path  TEXT NOT NULL,
+                    local_path   TEXT NOT NULL,
+                    size         INTEGER NOT NULL,
+                    sha256       TEXT NOT NULL,
+                    uploaded_at  TEXT NOT NULL,
+                    PRIMARY KEY (file_system, remote_path)
+                )
+            """)
+
+    def is_uploaded(self, file_system, remote_path, size, sha256):
+        """True if exactly this content is already at remote_path"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, sha256 FROM uploads WHERE file_system = ? AND remote_path = ?",
+                (file_system, remote_path),
+            ).fetchone()
+        return row is not None and row[0] == size and row[1] == sha256
+
+    def record(self, file_system, remote_path, local_path, size, sha256):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+                (file_system, remote_path, local_path, size, sha256,
+                 datetime.now().isoformat(timespec="seconds")),
+            )
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,148 @@
+"""
+Append-only result writers
+- Rows are buffered and appended, never rewritten
+- Every flush is followed by fsync, so a crash loses at most one buffer
+- A torn last line from a crash is trimmed when the file is reopened
+- A file written with an older column list is migrated (missing columns
+  added) or, if its columns differ otherwise, set aside as <name>.legacy-<ts>
+"""
+
+import csv
+import os
+import threading
+import time
+
+
+def _trim_partial_line(path):
+    """Drop an incomplete trailing line left behind by a crash"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b"\n":
+            return
+        f.seek(0)
+        data = f.read()
+        f.truncate(data.rfind(b"\n") + 1)
+
+
+class AppendOnlyCsvWriter:
+    """
+    Thread-safe, row-buffered CSV appender.
+
+    Buffered rows are written when flush_every rows are waiting or
+    flush_interval seconds have passed since the last flush. flush_every=1
+    makes every row durable on its own.
+    """
+
+    def __init__(self, path, fieldnames, flush_every=20, flush_interval=5.0):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        _trim_partial_line(path)
+
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._upgrade_existing(path)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+
+        self.file = open(path, "a", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames,
+                                     extrasaction="ignore", lineterminator="\n")
+        if new_file:
+            self.writer.writeheader()
+            self._sync()
+
+        self.buffer = []
+        self.last_flush = time.time()
+        self.lock = threading.Lock()
+
+    def _upgrade_existing(self, path):
+        """Bring a file with a different header in line with self.fieldnames"""
+        with open(path, newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        if header == self.fieldnames:
+            return
+
+        if set(header) <= set(self.fieldnames):
+            # Older column list: rewrite once with the new columns left empty
+            tmp_path = path + ".tmp"
+            with open(path, newline="", encoding="utf-8") as src, \
+                    open(tmp_path, "w", newline="", encoding="utf-8") as dst:
+                writer = csv.DictWriter(dst, fieldnames=self.fieldnames, lineterminator="\n")
+                writer.writeheader()
+                writer.writerows(csv.DictReader(src))
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(tmp_path, path)
+            added = [c for c in self.fieldnames if c not in header]
+            print(f"🔧 {path}: added columns {added}")
+            return
+
+        # Unrelated columns: keep the old file aside (not *.csv, so it is not uploaded) and start a new one
+        legacy_path = f"{path}.legacy-{time.strftime('%Y%m%d%H%M%S')}"
+        os.replace(path, legacy_path)
+        print(f"⚠️ {path} has columns {header}, expected {self.fieldnames}; moved to {legacy_path}")
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def _flush_locked(self):
+        if self.buffer:
+            self.writer.writerows(self.buffer)
+            self._sync()
+            self.rows_written += len(self.buffer)
+            self.buffer = []
+        self.last_flush = time.time()
+
+    def write(self, row):
+        with self.lock:
+            self.buffer.append(row)
+            if (len(self.buffer) >= self.flush_every or
+                    time.time() - self.last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def close(self):
+        with self.lock:
+            self._flush_locked()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_done_keys(path, key, since_column=None, since=None, payload_columns=None):
+    """
+    Keys already present in an append-only CSV (streamed, not loaded into memory).
+
+    If since_column/since are given, only rows with row[since_column] >= since
+    count, e.g. rows scraped after the current work list was planned.
+    If payload_columns are given, only rows with a value in at least one of them
+    count, so error rows (key only) are retried after a restart.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    _trim_partial_line(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            value = (row.get(key) or "").strip().upper()
+            if not value:
+                continue
+            if since_column and since and (row.get(since_column) or "") < since:
+                continue
+            if payload_columns and not any((row.get(c) or "").strip() for c in payload_columns):
+                continue
+            done.add(value)
+    return done
@@ -1,100 +1,277 @@
+"""
+Companies.sg Scraper - WORKER POOL VERSION
+- N Chrome workers pull UENs from one shared queue
+- Every UEN outcome is journaled (JSONL) as soon as it is scraped
+- Results are appended to the output CSV (flush + fsync), never rewritten
+- A restart skips UENs already scraped successfully (error rows are retried)
+- The CSV is converted to typed bronze Parquet at the end of the run
+- Reports pages/sec and error rate while running
+- Stage telemetry (page-load/parse latency, errors, RSS, Chrome count) via common.telemetry
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
 import pandas as pd
-import re, time
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.html_parsing import extract_labels
+from common.bronze_writer import csv_to_parquet
+from common.telemetry import StageTelemetry
+from common.writers import AppendOnlyCsvWriter, read_done_keys
+
 # ==================== CONFIG ====================
 INPUT_CSV = "data/bronze/acra/acra_data.csv"
+WORKLIST_CSV = "data/plans/companies_sg_worklist.csv"  # written by scrape_planner.py
 OUTPUT_CSV = "data/bronze/companies_sg/companies_sg_data.csv"
+JOURNAL_FILE = "data/bronze/companies_sg/companies_sg_journal.jsonl"
 MAX_ROWS = 10000
+NUM_WORKERS = 4        # ⬅️ number of parallel browsers
+HEADLESS = False       # visible browser helps with CAPTCHA
 WAIT_TIMEOUT = 20
 SLEEP_AFTER_LOAD = 2
-SAVE_INTERVAL = 500    # ⬅️ save after every 500 rows
+FLUSH_EVERY = 10       # ⬅️ flush + fsync the output after every 10 rows
+FLUSH_INTERVAL = 5     # ⬅️ ...or after 5 seconds, whichever comes first
+METRICS_INTERVAL = 50  # ⬅️ print pages/sec + error rate every 50 rows
 # =================================================
 
-# --- Load & clean data ---
-df = pd.read_csv(INPUT_CSV, dtype=str, keep_default_na=False)
-print(f"✅ Loaded {len(df)} records from {INPUT_CSV}")
-df = df.head(MAX_ROWS)
-
-# --- Setup Chrome ---
-options = Options()
-options.add_argument("--start-maximized")
-# options.add_argument("--headless=new")  # uncomment for headless
-options.add_argument("--disable-blink-features=AutomationControlled")
-options.add_experimental_option("excludeSwitches", ["enable-automation"])
-options.add_experimental_option("useAutomationExtension", False)
-driver = webdriver.Chrome(options=options)
-
-# --- Helper function ---
-def extract_text(soup, label):
-    """Finds a label span and returns the next <label> text."""
-    el = soup.find("span", string=re.compile(label, re.I))
-    if el:
-        val = el.find_next("label")
-        if val:
-            return val.get_text(strip=True)
-    return None
-
-results = []
-
-for i, row in df.iterrows():
-    uen = row.get("uen", "").strip()
-    name = row.get("entity_name", "").strip()
-
-    if not uen or not name:
-        continue
-
-    # Normalize for URL
+LABELS = [
+    "Entity Name",
+    "UEN",
+    "Registration Incorporation Date",
+    "Company Type Description",
+    "Entity Status Description",
+    "Entity Type Description",
+]
+
+OUTPUT_COLUMNS = LABELS + ["URL", "scraped_at"]
+
+
+def setup_driver(headless=HEADLESS):
+    """Setup one Chrome instance for a worker"""
+    options = Options()
+    options.add_argument("--start-maximized")
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    return webdriver.Chrome(options=options)
+
+
+def build_url(uen, name):
+    """Build the companies.sg business URL for a company"""
     name_url = name.replace(".", "").replace(" ", "-")
-    url = f"https://www.companies.sg/business/{uen}/{name_url}-"
-    print(f"[{i+1}] Fetching: {url}")
+    return f"https://www.companies.sg/business/{uen}/{name_url}-"
 
-    try:
+
+def empty_record(uen, url):
+    """Record written when a page could not be scraped"""
+    record = {label: None for label in LABELS}
+    record["UEN"] = uen
+    record["URL"] = url
+    return record
+
+
+def scrape_company(driver, uen, name, tel):
+    """Load one company page and extract all labels"""
+    url = build_url(uen, name)
+    with tel.timer("page_load"):
         driver.get(url)
         WebDriverWait(driver, WAIT_TIMEOUT).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "h1"))
         )
-        time.sleep(SLEEP_AFTER_LOAD)
-
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        data = {
-            "Entity Name": extract_text(soup, "Entity Name"),
-            "UEN": extract_text(soup, "UEN"),
-            "Registration Incorporation Date": extract_text(soup, "Registration Incorporation Date"),
-            "Company Type Description": extract_text(soup, "Company Type Description"),
-            "Entity Status Description": extract_text(soup, "Entity Status Description"),
-            "Entity Type Description": extract_text(soup, "Entity Type Description"),
-            "URL": url,
+    time.sleep(SLEEP_AFTER_LOAD)
+
+    with tel.timer("parse"):
+        data = extract_labels(driver.page_source, LABELS)
+    data["UEN"] = data["UEN"] or uen
+    data["URL"] = url
+    return data
+
+
+class ScrapeMetrics:
+    """Thread-safe page counters for pages/sec and error rate"""
+
+    def __init__(self, total):
+        self.total = total
+        self.pages = 0
+        self.errors = 0
+        self.start_time = time.time()
+        self.lock = threading.Lock()
+
+    def record(self, ok):
+        with self.lock:
+            self.pages += 1
+            if not ok:
+                self.errors += 1
+            return self.pages
+
+    def snapshot(self):
+        with self.lock:
+            elapsed = time.time() - self.start_time
+            return {
+                "pages": self.pages,
+                "errors": self.errors,
+                "elapsed_sec": round(elapsed, 1),
+                "pages_per_sec": round(self.pages / elapsed, 3) if elapsed > 0 else 0.0,
+                "error_rate": round(self.errors / self.pages, 4) if self.pages else 0.0,
+            }
+
+    def print_progress(self):
+        m = self.snapshot()
+        remaining = (self.total - m["pages"]) / m["pages_per_sec"] if m["pages_per_sec"] else 0
+        print(f"\n📊 {m['pages']}/{self.total} pages | {m['pages_per_sec']:.2f} pages/sec | "
+              f"error rate {m['error_rate']*100:.1f}% | remaining ~{remaining/60:.0f}m\n")
+
+
+class ResultJournal:
+    """Append-only JSONL journal with one line per scraped UEN"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+        self.lock = threading.Lock()
+
+    def write(self, uen, worker_id, status, elapsed, error=None):
+        entry = {
+            "uen": uen,
+            "worker": worker_id,
+            "status": status,
+            "elapsed_sec": round(elapsed, 2),
+            "error": error,
+            "ts": datetime.now().isoformat(timespec="seconds"),
         }
+        with self.lock:
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
 
-        results.append(data)
-        print(f"✅ Parsed: {data['Entity Name'] or 'N/A'}")
 
+def worker(worker_id, task_queue, writer, journal, metrics, tel):
+    """Pull companies from the shared queue until it is empty"""
+    try:
+        driver = setup_driver()
     except Exception as e:
-        print(f"⚠️ Error fetching {uen}: {e}")
-        results.append({
-            "Entity Name": None,
-            "UEN": uen,
-            "Registration Incorporation Date": None,
-            "Company Type Description": None,
-            "Entity Status Description": None,
-            "Entity Type Description": None,
-            "URL": url,
-        })
-
-    # Save every 500 rows
-    if (i + 1) % SAVE_INTERVAL == 0:
-        pd.DataFrame(results).to_csv(OUTPUT_CSV, index=False)
-        print(f"💾 Saved {len(results)} records so far → {OUTPUT_CSV}")
-
-driver.quit()
-
-# Final save
-pd.DataFrame(results).to_csv(OUTPUT_CSV, index=False)
-print(f"\n🎯 Completed scraping {len(results)} companies → {OUTPUT_CSV}")
+        tel.error(e)
+        print(f"[Worker-{worker_id}] ❌ Could not start Chrome: {e}")
+        return
+
+    try:
+        while True:
+            try:
+                uen, name = task_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            start = time.time()
+            try:
+                data = scrape_company(driver, uen, name, tel)
+                status, error = "ok", None
+                print(f"[Worker-{worker_id}] ✅ Parsed: {data['Entity Name'] or 'N/A'}")
+            except Exception as e:
+                data = empty_record(uen, build_url(uen, name))
+                status, error = "error", f"{type(e).__name__}: {str(e)[:200]}"
+                tel.error(e)
+                print(f"[Worker-{worker_id}] ⚠️ Error fetching {uen}: {error}")
+
+            data["scraped_at"] = datetime.now().isoformat(timespec="seconds")
+            writer.write(data)
+            journal.write(uen, worker_id, status, time.time() - start, error)
+            tel.item()
+
+            done = metrics.record(status == "ok")
+            if done % METRICS_INTERVAL == 0:
+                metrics.print_progress()
+
+            task_queue.task_done()
+    finally:
+        driver.quit()
+        print(f"[Worker-{worker_id}] ✅ Finished")
+
+
+def run(df, tel, num_workers=NUM_WORKERS, done_uens=frozenset()):
+    """Scrape every company in df with a pool of browser workers"""
+    task_queue = queue.Queue()
+    skipped = 0
+    for _, row in df.iterrows():
+        uen = row.get("uen", "").strip()
+        name = row.get("entity_name", "").strip()
+        if not uen or not name:
+            continue
+        if uen.upper() in done_uens:
+            skipped += 1
+            continue
+        task_queue.put((uen, name))
+
+    total = task_queue.qsize()
+    if skipped:
+        print(f"⏭️  Skipping {skipped} companies already in {OUTPUT_CSV}")
+    print(f"🚀 Scraping {total} companies with {num_workers} workers\n")
+
+    journal = ResultJournal(JOURNAL_FILE)
+    metrics = ScrapeMetrics(total)
+
+    with AppendOnlyCsvWriter(OUTPUT_CSV, OUTPUT_COLUMNS, FLUSH_EVERY, FLUSH_INTERVAL) as writer:
+        threads = [
+            threading.Thread(
+                target=worker,
+                args=(i + 1, task_queue, writer, journal, metrics, tel),
+                daemon=True,
+            )
+            for i in range(num_workers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    journal.close()
+    return writer.rows_written, metrics.snapshot()
+
+
+def main():
+    # Only visit the UENs the planner found gaps/conflicts for
+    input_csv = WORKLIST_CSV if os.path.exists(WORKLIST_CSV) else INPUT_CSV
+    df = pd.read_csv(input_csv, dtype=str, keep_default_na=False)
+    print(f"✅ Loaded {len(df)} records from {input_csv}")
+    df = df.head(MAX_ROWS)
+
+    # Resume: skip UENs already written for this work list
+    since = None
+    if input_csv == WORKLIST_CSV:
+        since = datetime.fromtimestamp(os.path.getmtime(WORKLIST_CSV)).isoformat(timespec="seconds")
+    # Error rows only carry UEN and URL, so they do not count as done and are retried
+    payload = [label for label in LABELS if label != "UEN"]
+    done_uens = read_done_keys(OUTPUT_CSV, "UEN", since_column="scraped_at", since=since,
+                               payload_columns=payload)
+
+    with StageTelemetry("companies_sg") as tel:
+        written, summary = run(df, tel, NUM_WORKERS, done_uens)
+        if os.path.exists(OUTPUT_CSV):
+            csv_to_parquet(OUTPUT_CSV, "companies_sg")
+        tel.set(workers=NUM_WORKERS, rows_written=written)
+
+    print(f"\n🎯 Completed scraping {written} companies → {OUTPUT_CSV}")
+    print(f"   Workers: {NUM_WORKERS}")
+    print(f"   Pages/sec: {summary['pages_per_sec']:.2f}")
+    print(f"   Error rate: {summary['error_rate']*100:.1f}% ({summary['errors']} errors)")
+    print(f"   Time: {summary['elapsed_sec']/60:.1f} minutes")
+    print(f"   Journal: {JOURNAL_FILE}")
+
+
+if __name__ == "__main__":
+    main()
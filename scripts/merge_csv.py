@@ -1,25 +1,163 @@
-import pandas as pd
+"""
+Merge + deduplicate partial scraper outputs (data/temp/*.csv) by UEN
+- Files are streamed in chunks, never loaded whole
+- Pass 1: rows are hash-partitioned by UEN into spill files
+- Pass 2: each partition is deduplicated on its own and appended to the output
+- The partition count is sized from the input bytes and MEMORY_BUDGET_MB, so memory
+  stays bounded by CHUNK_ROWS + one partition, whatever the input size
+- The merged CSV is also converted to typed bronze Parquet
+- Deterministic winner per UEN: most non-empty fields, then latest scrape time
+  (scraped_at column, else file modified time), then file name
+- Stage telemetry (per-file / per-pass timings, rows, RSS) via common.telemetry
+"""
+
 import glob
+import math
 import os
+import shutil
+from datetime import datetime
+
+import pandas as pd
+
+from common.bronze_writer import csv_to_parquet
+from common.telemetry import StageTelemetry
+
+# ==================== CONFIG ====================
+INPUT_GLOB = "data/temp/*.csv"
+OUTPUT_CSV = "data/bronze/recordowld/recordowl.csv"
+SPILL_DIR = "data/temp/_spill"
+KEY = "uen"
+MEMORY_BUDGET_MB = 256  # ⬅️ target size of one pass-2 partition in memory
+CSV_EXPANSION = 8       # ⬅️ pandas string frame size / CSV bytes (object columns + row metadata)
+MIN_PARTITIONS = 16
+MAX_PARTITIONS = 4096
+CHUNK_ROWS = 50_000     # ⬅️ rows read per chunk in pass 1
+SCRAPED_FORMAT = "%Y-%m-%dT%H:%M:%S"
+# =================================================
+
+def partition_count(files, budget_mb=MEMORY_BUDGET_MB):
+    """Enough partitions that one partition's frame fits the memory budget"""
+    input_bytes = sum(os.path.getsize(path) for path in files)
+    needed = math.ceil(input_bytes * CSV_EXPANSION / (budget_mb * 1024 * 1024))
+    return min(max(needed, MIN_PARTITIONS), MAX_PARTITIONS)
+
+
+def read_columns(files):
+    """Union of all headers, in first-seen order"""
+    columns = []
+    for path in files:
+        for column in pd.read_csv(path, nrows=0).columns:
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def spill_path(partition):
+    return os.path.join(SPILL_DIR, f"part_{partition:03d}.csv")
+
+
+def partition_file(path, columns, num_partitions):
+    """Pass 1: stream one file and append its rows to the spill partitions"""
+    file_name = os.path.basename(path)
+    file_time = pd.Timestamp(datetime.fromtimestamp(os.path.getmtime(path))).floor("s")
+    rows, skipped = 0, 0
+
+    for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=CHUNK_ROWS):
+        chunk = chunk.reindex(columns=columns, fill_value="")
+        chunk["_key"] = chunk[KEY].str.strip().str.upper()
+
+        blank = chunk["_key"] == ""
+        skipped += int(blank.sum())
+        chunk = chunk[~blank]
+        if chunk.empty:
+            continue
+
+        values = chunk[[c for c in columns if c != KEY]]
+        chunk["_filled"] = values.apply(lambda s: s.str.strip() != "").sum(axis=1)
+        # Compare scrape times as timestamps, not text; unparseable or missing -> file modified time
+        scraped = chunk["scraped_at"] if "scraped_at" in chunk else pd.Series("", index=chunk.index)
+        scraped = pd.to_datetime(scraped.where(scraped.str.strip() != ""), format="ISO8601", errors="coerce")
+        chunk["_scraped"] = scraped.fillna(file_time).dt.strftime(SCRAPED_FORMAT)
+        chunk["_file"] = file_name
+
+        buckets = pd.util.hash_pandas_object(chunk["_key"], index=False) % num_partitions
+        for partition, part in chunk.groupby(buckets.values):
+            target = spill_path(partition)
+            part.to_csv(target, mode="a", header=not os.path.exists(target), index=False)
+        rows += len(chunk)
+
+    return rows, skipped
+
+
+def dedup_partitions(columns, output_tmp, num_partitions):
+    """Pass 2: keep the best row per UEN in each partition and append it to the output"""
+    unique, largest = 0, 0
+    header = True
+
+    for partition in range(num_partitions):
+        path = spill_path(partition)
+        if not os.path.exists(path):
+            continue
+
+        part = pd.read_csv(path, dtype=str, keep_default_na=False)
+        part["_filled"] = part["_filled"].astype(int)
+        part["_scraped"] = pd.to_datetime(part["_scraped"], format=SCRAPED_FORMAT)
+        largest = max(largest, len(part))
+
+        best = (part
+                .sort_values(["_key", "_filled", "_scraped", "_file"],
+                             ascending=[True, False, False, False], kind="mergesort")
+                .drop_duplicates("_key", keep="first"))
+
+        best[columns].to_csv(output_tmp, mode="w" if header else "a", header=header, index=False)
+        header = False
+        unique += len(best)
+
+    if header:
+        # every key was blank: still produce a (header-only) output
+        pd.DataFrame(columns=columns).to_csv(output_tmp, index=False)
+    return unique, largest
+
+
+def main(tel):
+    files = sorted(glob.glob(INPUT_GLOB))
+    if not files:
+        print(f"No CSV files found in {INPUT_GLOB}")
+        return
 
-# ✅ Your input folder
-input_path = "data/temp/*.csv"   # adjust path
+    print(f"📂 Merging {len(files)} files from {INPUT_GLOB}")
+    columns = read_columns(files)
+    if KEY not in columns:
+        raise ValueError(f"No '{KEY}' column in {INPUT_GLOB}")
 
-# ✅ Step 1: Read all CSV files
-all_files = glob.glob(input_path)
+    shutil.rmtree(SPILL_DIR, ignore_errors=True)
+    os.makedirs(SPILL_DIR)
+    num_partitions = partition_count(files)
+    print(f"🧮 {num_partitions} partitions for a {MEMORY_BUDGET_MB} MB budget")
 
-dfs = []
-for file in all_files:
-    df = pd.read_csv(file)
-    dfs.append(df)
+    total_rows, total_skipped = 0, 0
+    for path in files:
+        with tel.timer("partition_file"):
+            rows, skipped = partition_file(path, columns, num_partitions)
+        total_rows += rows
+        total_skipped += skipped
 
-# ✅ Step 2: Merge them into one DataFrame
-merged_df = pd.concat(dfs, ignore_index=True)
+    os.makedirs(os.path.dirname(OUTPUT_CSV), exist_ok=True)
+    output_tmp = OUTPUT_CSV + ".tmp"
+    with tel.timer("dedup"):
+        unique, largest = dedup_partitions(columns, output_tmp, num_partitions)
+    os.replace(output_tmp, OUTPUT_CSV)
+    csv_to_parquet(OUTPUT_CSV, "recordowl")
+    shutil.rmtree(SPILL_DIR, ignore_errors=True)
+    tel.item(total_rows)
+    tel.set(files=len(files), unique=unique, largest_partition=largest, partitions=num_partitions)
 
-# ✅ Step 3: Deduplicate using UEN
-dedup_df = merged_df.drop_duplicates(subset=["uen"], keep="first")
+    print(f"✅ Rows read: {total_rows} (skipped {total_skipped} without {KEY})")
+    print(f"✅ Unique {KEY}s: {unique} ({total_rows - unique} duplicates dropped)")
+    print(f"✅ Largest partition: {largest} rows")
+    print(f"✅ Done! Merged & deduplicated CSV saved as {OUTPUT_CSV}")
 
-# ✅ Step 4: Save output
-dedup_df.to_csv("data/bronze/recordowld/recordowl.csv", index=False)
 
-print("✅ Done! Merged & deduplicated CSV saved as acra_merged_dedup.csv")
+if __name__ == "__main__":
+    with StageTelemetry("merge_csv") as tel:
+        main(tel)
@@ -1,6 +1,7 @@
 """
 RecordOwl Comprehensive Scraper
 Extracts ALL available data from company pages
+Stage telemetry (page-load/parse latency, errors, RSS, Chrome count) via common.telemetry
 """
 
 import pandas as pd
@@ -12,13 +13,19 @@ import time
 import random
 import os
 import re
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.telemetry import StageTelemetry
 
 class RecordOwlComprehensiveScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, telemetry=None):
         print("Setting up browser...\n")
         
         self.headless_mode = headless  # Store for restart
+        self.tel = telemetry or StageTelemetry("recordowl")
         
         options = uc.ChromeOptions()
         if headless:
@@ -228,8 +235,10 @@ class RecordOwlComprehensiveScraper:
             
             try:
                 self.driver.set_page_load_timeout(30)
-                self.driver.get(search_url)
+                with self.tel.timer("search_load"):
+                    self.driver.get(search_url)
             except Exception as e:
+                self.tel.error(e)
                 if retry < max_retries:
                     print(f"    ⚠️ Timeout, retrying... ({retry + 1}/{max_retries})")
                     time.sleep(3)
@@ -245,14 +254,17 @@ class RecordOwlComprehensiveScraper:
                 )
                 company_url = element.get_attribute("href")
             except:
+                self.tel.error("CompanyNotFound")
                 print(f"    ❌ Company not found in search")
                 return None
             
             # Step 2: Visit company page
             try:
                 self.driver.set_page_load_timeout(30)
-                self.driver.get(company_url)
+                with self.tel.timer("page_load"):
+                    self.driver.get(company_url)
             except Exception as e:
+                self.tel.error(e)
                 if retry < max_retries:
                     print(f"    ⚠️ Timeout on company page, retrying...")
                     time.sleep(3)
@@ -265,6 +277,7 @@ class RecordOwlComprehensiveScraper:
             time.sleep(random.uniform(2, 3))
             
             # Step 3: Extract all data
+            parse_start = time.perf_counter()
             data = {
                 'uen': uen,
                 'company_name': company_name,
@@ -321,6 +334,7 @@ class RecordOwlComprehensiveScraper:
             for platform, link in social_media.items():
                 if platform in data:
                     data[platform] = link
+            self.tel.observe("parse", time.perf_counter() - parse_start)
             
             # Short delay before next request
             time.sleep(random.uniform(1, 2))
@@ -328,6 +342,7 @@ class RecordOwlComprehensiveScraper:
             return data
             
         except Exception as e:
+            self.tel.error(e)
             if "timeout" in str(e).lower() and retry < max_retries:
                 print(f"    ⚠️ Timeout, retrying... ({retry + 1}/{max_retries})")
                 time.sleep(3)
@@ -365,6 +380,7 @@ class RecordOwlComprehensiveScraper:
             
             # Scrape
             data = self.scrape_company(uen, company_name)
+            self.tel.item()
             
             # Show result
             if data:
@@ -474,9 +490,15 @@ if __name__ == "__main__":
     
     # Configuration
     INPUT_FILE = 'data/bronze/acra/acra_data.csv'
+    WORKLIST_FILE = 'data/plans/recordowl_worklist.csv'  # written by scrape_planner.py
     OUTPUT_FILE = f'data/bronze/recordowld/websites_recordowl_{timestamp}.csv'
     NUM_COMPANIES = 10000    # Change this as needed
     START_FROM = 2949          # Resume from here if needed
+    
+    # Only visit the UENs the planner found gaps for
+    if os.path.exists(WORKLIST_FILE):
+        INPUT_FILE = WORKLIST_FILE
+        START_FROM = 0
     HEADLESS = False         # False = see browser (recommended)
     
     # Time estimate
@@ -505,85 +527,92 @@ if __name__ == "__main__":
     print(f"  ✓ Social Media Links (Facebook, LinkedIn, Twitter, Instagram, etc.)")
     print()
     
-    input("Press ENTER to start...")
-    print()
+    if sys.stdin.isatty():      # no prompt when run by the scheduler
+        input("Press ENTER to start...")
+        print()
     
-    scraper = None
+    with StageTelemetry("recordowl") as tel:
+        scraper = None
     
-    try:
-        # Load data
-        df = pd.read_csv(INPUT_FILE, low_memory=False)
-        print(f"Loaded {len(df)} companies from CSV\n")
-        
-        # Initialize scraper
-        scraper = RecordOwlComprehensiveScraper(headless=HEADLESS)
-        
-        # Apply filters
-        df = scraper.filter_data(df)
-        
-        # Process companies
-        results = scraper.process_batch(df, NUM_COMPANIES, START_FROM)
-        
-        # Save final output
-        results.to_csv(OUTPUT_FILE, index=False)
-        
-        # Final summary
-        total = len(results)
-        found_websites = results['website'].notna().sum()
-        found_phones = results['contact_number'].notna().sum()
-        found_addresses = results['registered_address'].notna().sum()
-        found_descriptions = results['description'].notna().sum()
-        found_ssic_primary = results['primary_ssic_code'].notna().sum()
-        found_ssic_secondary = results['secondary_ssic_code'].notna().sum()
-        
-        # Count social media
-        social_platforms = ['facebook', 'linkedin', 'twitter', 'instagram', 'youtube', 'tiktok', 'pinterest']
-        found_social = sum(1 for r in results.to_dict('records') if any(r.get(platform) for platform in social_platforms))
-        
-        print("\n" + "="*70)
-        print("SCRAPING COMPLETE!")
-        print("="*70)
-        print(f"Total processed: {total}")
-        print(f"\nData extracted:")
-        print(f"  Websites: {found_websites} ({found_websites/total*100:.1f}%)")
-        print(f"  Phone numbers: {found_phones} ({found_phones/total*100:.1f}%)")
-        print(f"  Addresses: {found_addresses} ({found_addresses/total*100:.1f}%)")
-        print(f"  Descriptions: {found_descriptions} ({found_descriptions/total*100:.1f}%)")
-        print(f"  Primary SSIC: {found_ssic_primary} ({found_ssic_primary/total*100:.1f}%)")
-        print(f"  Secondary SSIC: {found_ssic_secondary} ({found_ssic_secondary/total*100:.1f}%)")
-        print(f"  Social media: {found_social} ({found_social/total*100:.1f}%)")
-        print(f"\nFinal output saved to: {OUTPUT_FILE}")
-        print(f"Final checkpoint: data/bronze/recordowld/checkpoint/recordowl_final.csv")
-        print("="*70)
-        print()
+        try:
+            # Load data
+            df = pd.read_csv(INPUT_FILE, low_memory=False)
+            print(f"Loaded {len(df)} companies from {INPUT_FILE}\n")
         
-        # Show sample
-        if found_websites > 0:
-            print("Sample results (first 5 with websites):")
-            sample = results[results['website'].notna()].head(5)
-            for _, row in sample.iterrows():
-                print(f"\n  {row['company_name'][:45]}")
-                print(f"    Website: {row['website']}")
-                if row.get('contact_number'):
-                    print(f"    Phone: {row['contact_number']}")
-                if row.get('primary_industry'):
-                    print(f"    Industry: {row['primary_industry'][:50]}")
-            print()
-        
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Stopped by user (Ctrl+C)")
-        if 'results' in locals() and len(results) > 0:
-            partial_file = OUTPUT_FILE.replace('.csv', '_partial.csv')
-            pd.DataFrame(results).to_csv(partial_file, index=False)
-            print(f"Saved {len(results)} results to: {partial_file}")
-        
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
-        if 'results' in locals() and len(results) > 0:
-            partial_file = OUTPUT_FILE.replace('.csv', '_partial.csv')
-            pd.DataFrame(results).to_csv(partial_file, index=False)
-            print(f"Saved {len(results)} results to: {partial_file}")
-        
-    finally:
-        if scraper:
-            scraper.close()
\ No newline at end of file
+            # Initialize scraper
+            scraper = RecordOwlComprehensiveScraper(headless=HEADLESS, telemetry=tel)
+        
+            # Apply filters
+            df = scraper.filter_data(df)
+        
+            if df.iloc[START_FROM:START_FROM + NUM_COMPANIES].empty:
+                # The planner's best case: every page load avoided
+                print(f"✅ Nothing to scrape: no companies left in {INPUT_FILE} after filtering, no output written")
+            else:
+                # Process companies
+                results = scraper.process_batch(df, NUM_COMPANIES, START_FROM)
+        
+                # Save final output
+                results.to_csv(OUTPUT_FILE, index=False)
+        
+                # Final summary
+                total = len(results)
+                found_websites = results['website'].notna().sum()
+                found_phones = results['contact_number'].notna().sum()
+                found_addresses = results['registered_address'].notna().sum()
+                found_descriptions = results['description'].notna().sum()
+                found_ssic_primary = results['primary_ssic_code'].notna().sum()
+                found_ssic_secondary = results['secondary_ssic_code'].notna().sum()
+        
+                # Count social media
+                social_platforms = ['facebook', 'linkedin', 'twitter', 'instagram', 'youtube', 'tiktok', 'pinterest']
+                found_social = sum(1 for r in results.to_dict('records') if any(r.get(platform) for platform in social_platforms))
+        
+                print("\n" + "="*70)
+                print("SCRAPING COMPLETE!")
+                print("="*70)
+                print(f"Total processed: {total}")
+                print(f"\nData extracted:")
+                print(f"  Websites: {found_websites} ({found_websites/total*100:.1f}%)")
+                print(f"  Phone numbers: {found_phones} ({found_phones/total*100:.1f}%)")
+                print(f"  Addresses: {found_addresses} ({found_addresses/total*100:.1f}%)")
+                print(f"  Descriptions: {found_descriptions} ({found_descriptions/total*100:.1f}%)")
+                print(f"  Primary SSIC: {found_ssic_primary} ({found_ssic_primary/total*100:.1f}%)")
+                print(f"  Secondary SSIC: {found_ssic_secondary} ({found_ssic_secondary/total*100:.1f}%)")
+                print(f"  Social media: {found_social} ({found_social/total*100:.1f}%)")
+                print(f"\nFinal output saved to: {OUTPUT_FILE}")
+                print(f"Final checkpoint: data/bronze/recordowld/checkpoint/recordowl_final.csv")
+                print("="*70)
+                print()
+        
+                # Show sample
+                if found_websites > 0:
+                    print("Sample results (first 5 with websites):")
+                    sample = results[results['website'].notna()].head(5)
+                    for _, row in sample.iterrows():
+                        print(f"\n  {row['company_name'][:45]}")
+                        print(f"    Website: {row['website']}")
+                        if row.get('contact_number'):
+                            print(f"    Phone: {row['contact_number']}")
+                        if row.get('primary_industry'):
+                            print(f"    Industry: {row['primary_industry'][:50]}")
+                    print()
+        
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Stopped by user (Ctrl+C)")
+            if 'results' in locals() and len(results) > 0:
+                partial_file = OUTPUT_FILE.replace('.csv', '_partial.csv')
+                pd.DataFrame(results).to_csv(partial_file, index=False)
+                print(f"Saved {len(results)} results to: {partial_file}")
+        
+        except Exception as e:
+            tel.error(e)
+            print(f"\n❌ Error: {e}")
+            if 'results' in locals() and len(results) > 0:
+                partial_file = OUTPUT_FILE.replace('.csv', '_partial.csv')
+                pd.DataFrame(results).to_csv(partial_file, index=False)
+                print(f"Saved {len(results)} results to: {partial_file}")
+        
+        finally:
+            if scraper:
+                scraper.close()
\ No newline at end of file
@@ -1,6 +1,8 @@
 """
 RecordOwl Comprehensive Scraper - MULTITHREADED VERSION
 Extracts ALL available data from company pages
+Stage telemetry (page-load/parse latency, errors, RSS, Chrome count) via common.telemetry,
+shared by all worker threads
 """
 import pandas as pd
 from selenium.webdriver.common.by import By
@@ -11,14 +13,20 @@ import time
 import random
 import os
 import re
+import sys
 from datetime import datetime
+from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.telemetry import StageTelemetry
+
 class RecordOwlComprehensiveScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, telemetry=None):
         print("Setting up browser...\n")
         self.headless_mode = headless  # Store for restart
+        self.tel = telemetry or StageTelemetry("recordowl_multithread")
         
         options = uc.ChromeOptions()
         if headless:
@@ -228,8 +236,10 @@ class RecordOwlComprehensiveScraper:
             
             try:
                 self.driver.set_page_load_timeout(30)
-                self.driver.get(search_url)
+                with self.tel.timer("search_load"):
+                    self.driver.get(search_url)
             except Exception as e:
+                self.tel.error(e)
                 if retry < max_retries:
                     print(f"    ⚠️ Timeout, retrying... ({retry + 1}/{max_retries})")
                     time.sleep(3)
@@ -245,14 +255,17 @@ class RecordOwlComprehensiveScraper:
                 )
                 company_url = element.get_attribute("href")
             except:
+                self.tel.error("CompanyNotFound")
                 print(f"    ❌ Company not found in search")
                 return None
             
             # Step 2: Visit company page
             try:
                 self.driver.set_page_load_timeout(30)
-                self.driver.get(company_url)
+                with self.tel.timer("page_load"):
+                    self.driver.get(company_url)
             except Exception as e:
+                self.tel.error(e)
                 if retry < max_retries:
                     print(f"    ⚠️ Timeout on company page, retrying...")
                     time.sleep(3)
@@ -265,6 +278,7 @@ class RecordOwlComprehensiveScraper:
             time.sleep(random.uniform(2, 3))
             
             # Step 3: Extract all data
+            parse_start = time.perf_counter()
             data = {
                 'uen': uen,
                 'company_name': company_name,
@@ -321,6 +335,7 @@ class RecordOwlComprehensiveScraper:
             for platform, link in social_media.items():
                 if platform in data:
                     data[platform] = link
+            self.tel.observe("parse", time.perf_counter() - parse_start)
             
             # Short delay before next request
             time.sleep(random.uniform(1, 2))
@@ -328,6 +343,7 @@ class RecordOwlComprehensiveScraper:
             return data
             
         except Exception as e:
+            self.tel.error(e)
             if "timeout" in str(e).lower() and retry < max_retries:
                 print(f"    ⚠️ Timeout, retrying... ({retry + 1}/{max_retries})")
                 time.sleep(3)
@@ -374,9 +390,9 @@ class RecordOwlComprehensiveScraper:
 
 
 # MULTITHREADING WORKER FUNCTION
-def worker_thread(thread_id, companies_df, headless, results_lock, results_list, progress_lock, progress_counter):
-    """Each worker runs its own browser and scrapes companies"""
-    scraper = RecordOwlComprehensiveScraper(headless=headless)
+def worker_thread(thread_id, companies_df, headless, results_lock, results_list, progress_lock, progress_counter, tel):
+    """Each worker runs its own browser and scrapes companies; all workers record into one telemetry stage"""
+    scraper = RecordOwlComprehensiveScraper(headless=headless, telemetry=tel)
     local_count = 0
     
     try:
@@ -398,6 +414,7 @@ def worker_thread(thread_id, companies_df, headless, results_lock, results_list,
             # Thread-safe: add result
             with results_lock:
                 results_list.append(data)
+            tel.item()
             
             # Thread-safe: update progress
             with progress_lock:
@@ -433,9 +450,15 @@ if __name__ == "__main__":
     
     # Configuration
     INPUT_FILE = 'data/bronze/acra/acra_data.csv'
+    WORKLIST_FILE = 'data/plans/recordowl_worklist.csv'  # written by scrape_planner.py
     OUTPUT_FILE = f'data/bronze/recordowld/websites_recordowl_{timestamp}.csv'
     NUM_COMPANIES = 10000    # Change this as needed
     START_FROM = 4333        # Resume from here if needed
+    
+    # Only visit the UENs the planner found gaps for
+    if os.path.exists(WORKLIST_FILE):
+        INPUT_FILE = WORKLIST_FILE
+        START_FROM = 0
     NUM_THREADS = 3          # Number of parallel browsers
     HEADLESS = False         # False = see browser (recommended)
     
@@ -466,135 +489,144 @@ if __name__ == "__main__":
     print(f"  ✓ Social Media Links (Facebook, LinkedIn, Twitter, Instagram, etc.)")
     print()
     
-    input("Press ENTER to start...")
-    print()
+    if sys.stdin.isatty():      # no prompt when run by the scheduler
+        input("Press ENTER to start...")
+        print()
     
-    try:
-        # Load data
-        df = pd.read_csv(INPUT_FILE, low_memory=False)
-        print(f"Loaded {len(df)} companies from CSV\n")
+    with StageTelemetry("recordowl_multithread") as tel:
+        try:
+            # Load data
+            df = pd.read_csv(INPUT_FILE, low_memory=False)
+            print(f"Loaded {len(df)} companies from {INPUT_FILE}\n")
         
-        # Filter data (single-threaded)
-        temp_scraper = RecordOwlComprehensiveScraper(headless=HEADLESS)
-        df = temp_scraper.filter_data(df)
-        temp_scraper.close()
+            # Filter data (single-threaded)
+            temp_scraper = RecordOwlComprehensiveScraper(headless=HEADLESS, telemetry=tel)
+            df = temp_scraper.filter_data(df)
+            temp_scraper.close()
         
-        # Get subset
-        df = df.reset_index(drop=True)
-        df_subset = df.iloc[START_FROM:START_FROM + NUM_COMPANIES]
+            # Get subset
+            df = df.reset_index(drop=True)
+            df_subset = df.iloc[START_FROM:START_FROM + NUM_COMPANIES]
         
-        # Split into chunks for threads
-        chunk_size = len(df_subset) // NUM_THREADS
-        chunks = []
-        for i in range(NUM_THREADS):
-            start_idx = i * chunk_size
-            if i == NUM_THREADS - 1:
-                chunks.append(df_subset.iloc[start_idx:])
+            if df_subset.empty:
+                # The planner's best case: every page load avoided
+                print(f"✅ Nothing to scrape: no companies left in {INPUT_FILE} after filtering, no output written")
             else:
-                chunks.append(df_subset.iloc[start_idx:start_idx + chunk_size])
+                # Split into chunks for threads
+                chunk_size = len(df_subset) // NUM_THREADS
+                chunks = []
+                for i in range(NUM_THREADS):
+                    start_idx = i * chunk_size
+                    if i == NUM_THREADS - 1:
+                        chunks.append(df_subset.iloc[start_idx:])
+                    else:
+                        chunks.append(df_subset.iloc[start_idx:start_idx + chunk_size])
         
-        print(f"\nSplit {len(df_subset)} companies into {NUM_THREADS} threads:")
-        for i, chunk in enumerate(chunks):
-            print(f"  Thread-{i+1}: {len(chunk)} companies")
-        print()
+                print(f"\nSplit {len(df_subset)} companies into {NUM_THREADS} threads:")
+                for i, chunk in enumerate(chunks):
+                    print(f"  Thread-{i+1}: {len(chunk)} companies")
+                print()
         
-        # Thread-safe structures
-        results_lock = threading.Lock()
-        progress_lock = threading.Lock()
-        results_list = []
-        progress_counter = [0]
+                # Thread-safe structures
+                results_lock = threading.Lock()
+                progress_lock = threading.Lock()
+                results_list = []
+                progress_counter = [0]
         
-        # Create directories
-        os.makedirs("data/bronze/recordowld/checkpoint", exist_ok=True)
+                # Create directories
+                os.makedirs("data/bronze/recordowld/checkpoint", exist_ok=True)
         
-        # Start multithreading
-        start_time = time.time()
-        print("🚀 Starting parallel scraping...\n")
+                # Start multithreading
+                start_time = time.time()
+                print("🚀 Starting parallel scraping...\n")
         
-        with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
-            futures = []
-            for i, chunk in enumerate(chunks):
-                future = executor.submit(
-                    worker_thread,
-                    i + 1,
-                    chunk,
-                    HEADLESS,
-                    results_lock,
-                    results_list,
-                    progress_lock,
-                    progress_counter
-                )
-                futures.append(future)
+                with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+                    futures = []
+                    for i, chunk in enumerate(chunks):
+                        future = executor.submit(
+                            worker_thread,
+                            i + 1,
+                            chunk,
+                            HEADLESS,
+                            results_lock,
+                            results_list,
+                            progress_lock,
+                            progress_counter,
+                            tel
+                        )
+                        futures.append(future)
             
-            # Wait for completion
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    print(f"❌ Thread error: {e}")
+                    # Wait for completion
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            tel.error(e)
+                            print(f"❌ Thread error: {e}")
         
-        # Save results
-        results = pd.DataFrame(results_list)
-        results.to_csv(OUTPUT_FILE, index=False)
-        results.to_csv('data/bronze/recordowld/recordowl_final.csv', index=False)
+                # Save results
+                results = pd.DataFrame(results_list)
+                results.to_csv(OUTPUT_FILE, index=False)
+                results.to_csv('data/bronze/recordowld/recordowl_final.csv', index=False)
         
-        # Final summary
-        elapsed = time.time() - start_time
-        total = len(results)
-        found_websites = results['website'].notna().sum()
-        found_phones = results['contact_number'].notna().sum()
-        found_addresses = results['registered_address'].notna().sum()
-        found_descriptions = results['description'].notna().sum()
-        found_ssic_primary = results['primary_ssic_code'].notna().sum()
-        found_ssic_secondary = results['secondary_ssic_code'].notna().sum()
+                # Final summary
+                elapsed = time.time() - start_time
+                total = len(results)
+                found_websites = results['website'].notna().sum()
+                found_phones = results['contact_number'].notna().sum()
+                found_addresses = results['registered_address'].notna().sum()
+                found_descriptions = results['description'].notna().sum()
+                found_ssic_primary = results['primary_ssic_code'].notna().sum()
+                found_ssic_secondary = results['secondary_ssic_code'].notna().sum()
         
-        # Count social media
-        social_platforms = ['facebook', 'linkedin', 'twitter', 'instagram', 'youtube', 'tiktok', 'pinterest']
-        found_social = sum(1 for r in results.to_dict('records') if any(r.get(platform) for platform in social_platforms))
+                # Count social media
+                social_platforms = ['facebook', 'linkedin', 'twitter', 'instagram', 'youtube', 'tiktok', 'pinterest']
+                found_social = sum(1 for r in results.to_dict('records') if any(r.get(platform) for platform in social_platforms))
         
-        print("\n" + "="*70)
-        print("SCRAPING COMPLETE!")
-        print("="*70)
-        print(f"Total processed: {total}")
-        print(f"Time taken: {elapsed/60:.1f} minutes ({elapsed/3600:.2f} hours)")
-        print(f"Average: {elapsed/total:.2f} seconds per company")
-        print(f"Speedup: {NUM_THREADS}x faster than single-threaded")
-        print(f"\nData extracted:")
-        print(f"  Websites: {found_websites} ({found_websites/total*100:.1f}%)")
-        print(f"  Phone numbers: {found_phones} ({found_phones/total*100:.1f}%)")
-        print(f"  Addresses: {found_addresses} ({found_addresses/total*100:.1f}%)")
-        print(f"  Descriptions: {found_descriptions} ({found_descriptions/total*100:.1f}%)")
-        print(f"  Primary SSIC: {found_ssic_primary} ({found_ssic_primary/total*100:.1f}%)")
-        print(f"  Secondary SSIC: {found_ssic_secondary} ({found_ssic_secondary/total*100:.1f}%)")
-        print(f"  Social media: {found_social} ({found_social/total*100:.1f}%)")
-        print(f"\nFinal output saved to: {OUTPUT_FILE}")
-        print(f"Final checkpoint: data/bronze/recordowld/checkpoint/recordowl_final.csv")
-        print("="*70)
-        print()
+                print("\n" + "="*70)
+                print("SCRAPING COMPLETE!")
+                print("="*70)
+                print(f"Total processed: {total}")
+                print(f"Time taken: {elapsed/60:.1f} minutes ({elapsed/3600:.2f} hours)")
+                print(f"Average: {elapsed/total:.2f} seconds per company")
+                print(f"Speedup: {NUM_THREADS}x faster than single-threaded")
+                print(f"\nData extracted:")
+                print(f"  Websites: {found_websites} ({found_websites/total*100:.1f}%)")
+                print(f"  Phone numbers: {found_phones} ({found_phones/total*100:.1f}%)")
+                print(f"  Addresses: {found_addresses} ({found_addresses/total*100:.1f}%)")
+                print(f"  Descriptions: {found_descriptions} ({found_descriptions/total*100:.1f}%)")
+                print(f"  Primary SSIC: {found_ssic_primary} ({found_ssic_primary/total*100:.1f}%)")
+                print(f"  Secondary SSIC: {found_ssic_secondary} ({found_ssic_secondary/total*100:.1f}%)")
+                print(f"  Social media: {found_social} ({found_social/total*100:.1f}%)")
+                print(f"\nFinal output saved to: {OUTPUT_FILE}")
+                print(f"Final checkpoint: data/bronze/recordowld/checkpoint/recordowl_final.csv")
+                print("="*70)
+                print()
         
-        # Show sample
-        if found_websites > 0:
-            print("Sample results (first 5 with websites):")
-            sample = results[results['website'].notna()].head(5)
-            for _, row in sample.iterrows():
-                print(f"\n  {row['company_name'][:45]}")
-                print(f"    Website: {row['website']}")
-                if row.get('contact_number'):
-                    print(f"    Phone: {row['contact_number']}")
-                if row.get('primary_industry'):
-                    print(f"    Industry: {row['primary_industry'][:50]}")
-            print()
+                # Show sample
+                if found_websites > 0:
+                    print("Sample results (first 5 with websites):")
+                    sample = results[results['website'].notna()].head(5)
+                    for _, row in sample.iterrows():
+                        print(f"\n  {row['company_name'][:45]}")
+                        print(f"    Website: {row['website']}")
+                        if row.get('contact_number'):
+                            print(f"    Phone: {row['contact_number']}")
+                        if row.get('primary_industry'):
+                            print(f"    Industry: {row['primary_industry'][:50]}")
+                    print()
         
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Stopped by user (Ctrl+C)")
-        if 'results_list' in locals() and len(results_list) > 0:
-            partial_file = OUTPUT_FILE.replace('.csv', '_partial.csv')
-            pd.DataFrame(results_list).to_csv(partial_file, index=False)
-            print(f"Saved {len(results_list)} results to: {partial_file}")
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Stopped by user (Ctrl+C)")
+            if 'results_list' in locals() and len(results_list) > 0:
+                partial_file = OUTPUT_FILE.replace('.csv', '_partial.csv')
+                pd.DataFrame(results_list).to_csv(partial_file, index=False)
+                print(f"Saved {len(results_list)} results to: {partial_file}")
         
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
-        if 'results_list' in locals() and len(results_list) > 0:
-            partial_file = OUTPUT_FILE.replace('.csv', '_partial.csv')
-            pd.DataFrame(results_list).to_csv(partial_file, index=False)
-            print(f"Saved {len(results_list)} results to: {partial_file}")
\ No newline at end of file
+        except Exception as e:
+            tel.error(e)
+            print(f"\n❌ Error: {e}")
+            if 'results_list' in locals() and len(results_list) > 0:
+                partial_file = OUTPUT_FILE.replace('.csv', '_partial.csv')
+                pd.DataFrame(results_list).to_csv(partial_file, index=False)
+                print(f"Saved {len(results_list)} results to: {partial_file}")
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Minimal 5-field cron expressions: minute hour day-of-month month day-of-week
+- Supports *, lists (1,15), ranges (1-5), steps (*/6, 8-18/2) and day names (mon-fri)
+- Day-of-week 0 and 7 are both Sunday
+- Day-of-month and day-of-week follow cron rules: if both are restricted,
+  either one matching is enough
+"""
+
+from datetime import timedelta
+
+FIELDS = [
+    # name, min, max
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+]
+DAY_NAMES = {"sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6}
+MAX_LOOKAHEAD = timedelta(days=366 * 4)   # long enough for "29 Feb"
+
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.lower().split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Bad step in '{text}'")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(DAY_NAMES.get(p, p)) for p in part.split("-", 1))
+        else:
+            start = int(DAY_NAMES.get(part, part))
+            end = high if step > 1 else start
+
+        if not low <= start <= end <= high:
+            raise ValueError(f"'{text}' is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A parsed cron expression; next_after() gives the next fire time"""
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != len(FIELDS):
+            raise ValueError(f"Cron needs {len(FIELDS)} fields, got '{expression}'")
+        self.expression = expression
+
+        parsed = {name: _parse_field(part, low, high)
+                  for part, (name, low, high) in zip(parts, FIELDS)}
+        self.minutes = parsed["minute"]
+        self.hours = parsed["hour"]
+        self.days = parsed["day"]
+        self.months = parsed["month"]
+        self.weekdays = {d % 7 for d in parsed["weekday"]}
+        self.day_restricted = parts[2] != "*"
+        self.weekday_restricted = parts[4] != "*"
+
+    def _day_matches(self, dt):
+        weekday = (dt.weekday() + 1) % 7          # cron: Sunday = 0
+        day_ok = dt.day in self.days
+        weekday_ok = weekday in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, dt):
+        """First fire time strictly after dt (minute resolution)"""
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + MAX_LOOKAHEAD
+
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"'{self.expression}' never fires")
+
+    def __repr__(self):
+        return f"CronSchedule('{self.expression}')"
@@ -0,0 +1,187 @@
+"""
+Scheduler Daemon
+One long-lived process that replaces the separate run_*.py pollers
+- Jobs are declared in schedule.json: a cron expression + the DAG stages to run
+  (see pipeline_dag.py; an empty stage list means the whole pipeline)
+- Sleeps until the next fire time instead of polling every minute
+- Per-stage locks: a job is skipped if another running job already holds
+  one of its stages (e.g. websites while the full pipeline is scraping websites)
+- One global cap (max_browsers) on Chrome stages across all jobs
+- Missed-run catch-up: the last fire time of each job is kept in a state file;
+  after downtime a job with "catch_up": true runs once, right away
+
+Usage:
+    python daemon.py                # run forever
+    python daemon.py list           # show jobs and next fire times
+    python daemon.py run stocks     # run one job now (same locks), then exit
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from cron import CronSchedule
+from pipeline_dag import STAGES, PipelineRun, print_summary, select_stages
+
+BASE_DIR = Path(__file__).parent
+
+# ==================== CONFIG ====================
+CONFIG_PATH = Path(os.getenv("SCHEDULER_CONFIG", BASE_DIR / "schedule.json"))
+MAX_SLEEP = 60          # ⬅️ seconds; re-check at least this often (clock changes)
+# =================================================
+
+
+class Job:
+    def __init__(self, spec):
+        self.name = spec["name"]
+        self.cron = CronSchedule(spec["cron"])
+        self.stage_names = spec.get("stages") or list(STAGES)
+        self.stages = select_stages(self.stage_names)   # validates the names
+        self.catch_up = spec.get("catch_up", False)
+        self.enabled = spec.get("enabled", True)
+        self.next_fire = None
+
+
+class StateFile:
+    """Last fire time and outcome of each job, so restarts can catch up"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.data = json.loads(self.path.read_text(encoding="utf-8")) if self.path.exists() else {}
+
+    def last_fire(self, job_name):
+        value = self.data.get(job_name, {}).get("last_fire")
+        return datetime.fromisoformat(value) if value else None
+
+    def update(self, job_name, **fields):
+        with self.lock:
+            self.data.setdefault(job_name, {}).update(fields)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.data, indent=2), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+
+class SchedulerDaemon:
+    def __init__(self, config_path=CONFIG_PATH):
+        config = json.loads(Path(config_path).read_text(encoding="utf-8"))
+        self.jobs = [Job(spec) for spec in config["jobs"]]
+        self.browsers = threading.BoundedSemaphore(config.get("max_browsers", 2))
+        self.state = StateFile(Path(config_path).parent / config.get("state_file", "scheduler_state.json"))
+        self.busy_stages = {}                 # stage name -> job name holding it
+        self.busy_lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=len(self.jobs))
+
+    # ---------- locks ----------
+    def _claim(self, job):
+        with self.busy_lock:
+            holders = {self.busy_stages[s] for s in job.stage_names if s in self.busy_stages}
+            if holders:
+                return holders
+            for stage in job.stage_names:
+                self.busy_stages[stage] = job.name
+            return None
+
+    def _release(self, job):
+        with self.busy_lock:
+            for stage in job.stage_names:
+                self.busy_stages.pop(stage, None)
+
+    # ---------- running ----------
+    def _run_job(self, job):
+        try:
+            summary = PipelineRun(job.stages, browsers=self.browsers, name=job.name).execute()
+            print_summary(summary)
+            ok = all(r["status"] == "success" for r in summary["stages"].values())
+            status = "success" if ok else "failed"
+        except Exception as e:
+            print(f"❌ {job.name}: {type(e).__name__}: {e}")
+            status = "error"
+        finally:
+            self._release(job)
+        self.state.update(job.name, last_status=status,
+                          last_finished=datetime.now().isoformat(timespec="seconds"))
+        print(f"{'✅' if status == 'success' else '❌'} Job {job.name}: {status}")
+        return status
+
+    def launch(self, job, fire_time):
+        """Start job in the background unless one of its stages is busy"""
+        self.state.update(job.name, last_fire=fire_time.isoformat(timespec="seconds"))
+        holders = self._claim(job)
+        if holders:
+            print(f"⏭️  {job.name}: skipped, overlaps running job(s) {sorted(holders)}")
+            self.state.update(job.name, last_status="skipped_overlap")
+            return None
+        print(f"\n🚀 {datetime.now():%Y-%m-%d %H:%M:%S} starting job {job.name} {job.stage_names}")
+        return self.pool.submit(self._run_job, job)
+
+    # ---------- schedule ----------
+    def plan(self, now):
+        """Set each job's first fire time; missed runs are caught up once"""
+        for job in self.jobs:
+            if not job.enabled:
+                continue
+            last = self.state.last_fire(job.name)
+            missed = last is not None and job.cron.next_after(last) <= now
+            if missed and job.catch_up:
+                print(f"⏪ {job.name}: missed run since {last:%Y-%m-%d %H:%M}, catching up now")
+                job.next_fire = now
+            else:
+                job.next_fire = job.cron.next_after(now)
+
+    def print_jobs(self):
+        print(f"{'job':15} {'cron':14} {'next fire':18} stages")
+        for job in self.jobs:
+            when = f"{job.next_fire:%Y-%m-%d %H:%M}" if job.enabled else "disabled"
+            print(f"{job.name:15} {job.cron.expression:14} {when:18} {', '.join(job.stage_names)}")
+
+    def run_forever(self):
+        self.plan(datetime.now())
+        print("=" * 60 + "\n🗓️  SCHEDULER DAEMON STARTED\n" + "=" * 60)
+        self.print_jobs()
+        print("=" * 60)
+
+        active = [job for job in self.jobs if job.enabled]
+        if not active:
+            print("⚠️ No enabled jobs")
+            return
+        try:
+            while True:
+                now = datetime.now()
+                for job in active:
+                    if job.next_fire <= now:
+                        self.launch(job, now)
+                        job.next_fire = job.cron.next_after(now)
+                wake = min(job.next_fire for job in active)
+                time.sleep(min(max((wake - datetime.now()).total_seconds(), 1), MAX_SLEEP))
+        except KeyboardInterrupt:
+            running = sorted(set(self.busy_stages.values()))
+            print(f"\n🛑 Stopping{f', waiting for {running}' if running else ''}")
+        finally:
+            self.pool.shutdown(wait=True)
+
+
+def main():
+    daemon = SchedulerDaemon()
+    command = sys.argv[1] if len(sys.argv) > 1 else "daemon"
+
+    if command == "list":
+        daemon.plan(datetime.now())
+        daemon.print_jobs()
+    elif command == "run":
+        job = next((j for j in daemon.jobs if j.name == sys.argv[2]), None)
+        if job is None:
+            sys.exit(f"Unknown job: {sys.argv[2]}")
+        future = daemon.launch(job, datetime.now())
+        sys.exit(0 if future and future.result() == "success" else 1)
+    else:
+        daemon.run_forever()
+
+
+if __name__ == "__main__":
+    main()
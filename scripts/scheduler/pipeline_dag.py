@@ -0,0 +1,308 @@
+"""
+DAG Pipeline Orchestrator
+- Stages declare their dependencies; independent branches run in parallel
+    acra -> planner -> {recordowl, companies_sg} -> websites -> merge -> upload
+    stocks (independent) -> upload
+- MAX_PARALLEL stages at once, at most MAX_BROWSERS of them driving Chrome
+- Failed stages are retried (per-stage policy); if they still fail, only
+  their downstream stages are skipped - nothing waits for input()
+- Each stage logs to logs/<run_id>/<stage>.log; a JSON summary is written per run
+- Stage telemetry (duration, attempts, peak RSS, Chrome processes) goes to
+  data/telemetry; scripts get PIPELINE_RUN_ID so their own telemetry joins up
+
+Usage (from anywhere):
+    python scripts/scheduler/pipeline_dag.py                 # whole pipeline
+    python scripts/scheduler/pipeline_dag.py stocks upload   # only these stages
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+SCRIPTS_DIR = BASE_DIR.parent
+PROJECT_DIR = SCRIPTS_DIR.parent          # data/ paths are relative to here
+VENV_PYTHON = SCRIPTS_DIR / ".venv" / "Scripts" / "python.exe"
+LOG_DIR = BASE_DIR / "logs"
+TELEMETRY_DIR = PROJECT_DIR / "data" / "telemetry"
+
+sys.path.append(str(SCRIPTS_DIR))
+from common.telemetry import StageTelemetry
+
+# ==================== CONFIG ====================
+MAX_PARALLEL = 3        # ⬅️ stages running at the same time
+MAX_BROWSERS = 2        # ⬅️ stages driving Chrome at the same time
+RETRY_DELAY = 30        # ⬅️ seconds, multiplied by the attempt number
+
+STAGES = {
+    "acra": {
+        "scripts": ["acra/1_scrape_acra_gov_page.py", "acra/2_get_acra_urls.py", "acra/3_extract_acra.py"],
+        "deps": [],
+        "browser": True,
+        "retries": 2,
+        "timeout": 2 * 3600,
+    },
+    "planner": {
+        "scripts": ["scrape_planner.py"],
+        "deps": ["acra"],
+        "browser": False,
+        "retries": 0,
+        "timeout": 600,
+    },
+    "recordowl": {
+        "scripts": ["record0wld/1_main_record_freeze.py"],
+        "deps": ["planner"],
+        "browser": True,
+        "retries": 1,
+        "timeout": 12 * 3600,
+    },
+    "companies_sg": {
+        "scripts": ["companies_sg/1_sg_scraper.py"],
+        "deps": ["planner"],
+        "browser": True,
+        "retries": 1,
+        "timeout": 12 * 3600,
+    },
+    "stocks": {
+        "scripts": ["stocks/fetch_stocks.py"],
+        "deps": [],
+        "browser": False,     # HTTP fetch; Selenium is only its fallback
+        "retries": 2,
+        "timeout": 900,
+    },
+    "websites": {
+        "scripts": ["scrape_websites/1_website_scraper.py"],
+        "deps": ["recordowl", "companies_sg"],
+        "browser": True,
+        "retries": 1,
+        "timeout": 12 * 3600,
+    },
+    "merge": {
+        "scripts": ["merge_csv.py"],
+        "deps": ["websites"],
+        "browser": False,
+        "retries": 1,
+        "timeout": 1800,
+    },
+    "upload": {
+        "scripts": ["upload_adls.py"],
+        "deps": ["merge", "stocks"],
+        "browser": False,
+        "retries": 3,
+        "timeout": 3600,
+    },
+}
+# =================================================
+
+
+def topological_order(stages):
+    """Stage names in dependency order; raises ValueError on unknown deps or cycles"""
+    order, state = [], {}
+
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        state[name] = "visiting"
+        for dep in stages[name]["deps"]:
+            if dep not in stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+            visit(dep, path + [name])
+        state[name] = "done"
+        order.append(name)
+
+    for name in stages:
+        visit(name, [])
+    return order
+
+
+def select_stages(names=None, stages=STAGES):
+    """
+    Restrict the DAG to the named stages. Dependencies on stages outside the
+    selection are treated as already satisfied.
+    """
+    if not names:
+        return stages
+    unknown = [n for n in names if n not in stages]
+    if unknown:
+        raise ValueError(f"Unknown stages: {unknown}")
+    return {
+        name: {**stages[name], "deps": [d for d in stages[name]["deps"] if d in names]}
+        for name in names
+    }
+
+
+class PipelineRun:
+    """One execution of the DAG"""
+
+    def __init__(self, stages, max_parallel=MAX_PARALLEL, max_browsers=MAX_BROWSERS,
+                 browsers=None, name=None):
+        """
+        Args:
+            browsers: semaphore shared with other runs (the scheduler daemon's
+                global Chrome cap); a private one of max_browsers otherwise
+            name: appended to the run id, so concurrent runs get their own log folder
+        """
+        self.stages = stages
+        self.order = topological_order(stages)
+        self.max_parallel = max_parallel
+        self.browsers = browsers or threading.BoundedSemaphore(max_browsers)
+        self.python_exe = str(VENV_PYTHON) if VENV_PYTHON.exists() else sys.executable
+        self.name = name
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S") + (f"_{name}" if name else "")
+        self.log_dir = LOG_DIR / self.run_id
+        self.results = {}
+
+    def _run_script(self, script, log_file, timeout):
+        path = SCRIPTS_DIR / script
+        if not path.exists():
+            log_file.write(f"Script not found: {path}\n")
+            return 127
+        log_file.write(f"\n$ {path.name}  ({datetime.now():%H:%M:%S})\n")
+        log_file.flush()
+        try:
+            return subprocess.run(
+                [self.python_exe, str(path)],
+                cwd=PROJECT_DIR,
+                env={**os.environ, "PIPELINE_RUN_ID": self.run_id},
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                timeout=timeout,
+            ).returncode
+        except subprocess.TimeoutExpired:
+            log_file.write(f"\n⏱️ Timed out after {timeout}s\n")
+            return 124
+
+    def _run_stage(self, name):
+        stage = self.stages[name]
+        attempts = 1 + stage.get("retries", 0)
+        start = time.time()
+        log_path = self.log_dir / f"{name}.log"
+
+        with open(log_path, "a", encoding="utf-8") as log_file, \
+                StageTelemetry(f"dag_{name}", output_dir=TELEMETRY_DIR, run_id=self.run_id) as tel:
+            for attempt in range(1, attempts + 1):
+                if stage.get("browser"):
+                    with tel.timer("browser_wait"):
+                        self.browsers.acquire()
+                try:
+                    print(f"▶️  {name} (attempt {attempt}/{attempts})")
+                    failed = None
+                    for script in stage["scripts"]:
+                        with tel.timer("script"):
+                            code = self._run_script(script, log_file, stage.get("timeout"))
+                        if code != 0:
+                            tel.error(f"exit_{code}")
+                            failed = script
+                            break
+                        tel.item()
+                finally:
+                    if stage.get("browser"):
+                        self.browsers.release()
+
+                tel.set(attempts=attempt)
+                if failed is None:
+                    return {"status": "success", "attempts": attempt,
+                            "seconds": round(time.time() - start, 1), "log": str(log_path)}
+
+                print(f"⚠️  {name}: {failed} failed (attempt {attempt}/{attempts})")
+                if attempt < attempts:
+                    time.sleep(RETRY_DELAY * attempt)
+            tel.mark_failed()
+
+        return {"status": "failed", "attempts": attempts, "failed_script": failed,
+                "seconds": round(time.time() - start, 1), "log": str(log_path)}
+
+    def _skip_downstream(self, failed_name):
+        for name in self.order:
+            if name not in self.results and failed_name in self._ancestors(name):
+                self.results[name] = {"status": "skipped", "reason": f"upstream '{failed_name}' failed"}
+                print(f"⏭️  {name}: skipped (upstream '{failed_name}' failed)")
+
+    def _ancestors(self, name):
+        seen, stack = set(), list(self.stages[name]["deps"])
+        while stack:
+            dep = stack.pop()
+            if dep not in seen:
+                seen.add(dep)
+                stack.extend(self.stages[dep]["deps"])
+        return seen
+
+    def execute(self):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        started_at = datetime.now()
+        running = {}
+        tel = StageTelemetry(f"pipeline_{self.name}" if self.name else "pipeline",
+                             output_dir=TELEMETRY_DIR, run_id=self.run_id)
+
+        with tel, ThreadPoolExecutor(self.max_parallel) as pool:
+            while len(self.results) < len(self.stages):
+                for name in self.order:
+                    if name in self.results or name in running.values():
+                        continue
+                    if all(self.results.get(d, {}).get("status") == "success"
+                           for d in self.stages[name]["deps"]):
+                        running[pool.submit(self._run_stage, name)] = name
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except Exception as e:
+                        self.results[name] = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+                    icon = "✅" if self.results[name]["status"] == "success" else "❌"
+                    print(f"{icon} {name}: {self.results[name]['status']} "
+                          f"({self.results[name].get('seconds', 0)}s)")
+                    if self.results[name]["status"] == "success":
+                        tel.item()
+                    else:
+                        tel.error(self.results[name]["status"])
+                        tel.mark_failed()
+                        self._skip_downstream(name)
+
+        summary = {
+            "run_id": self.run_id,
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "stages": {name: self.results.get(name, {"status": "not_run"}) for name in self.order},
+        }
+        with open(self.log_dir / "summary.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+
+def print_summary(summary):
+    print("\n" + "=" * 60)
+    print(f"✨ PIPELINE RUN {summary['run_id']}")
+    print(f"⏰ {summary['started_at']} → {summary['finished_at']}")
+    print("=" * 60)
+    icons = {"success": "✅", "failed": "❌", "skipped": "⏭️ ", "not_run": "➖"}
+    for name, result in summary["stages"].items():
+        detail = result.get("reason") or result.get("failed_script") or result.get("error") or ""
+        attempts = f"{result['attempts']} attempt(s)" if "attempts" in result else ""
+        print(f"{icons.get(result['status'], '?')} {name:14} {result['status']:8} "
+              f"{result.get('seconds', ''):>8} {attempts:12} {detail}")
+    print("=" * 60 + "\n")
+
+
+def run_pipeline(stage_names=None):
+    """Run the (selected) DAG; returns True if every stage succeeded"""
+    summary = PipelineRun(select_stages(stage_names)).execute()
+    print_summary(summary)
+    return all(r["status"] == "success" for r in summary["stages"].values())
+
+
+if __name__ == "__main__":
+    ok = run_pipeline(sys.argv[1:] or None)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,289 @@
+"""
+Gap-driven Scrape Planner
+Compares ACRA's columns per UEN with the fields each scraper produces and
+writes a work list of only the UENs where a page load adds information
+
+Work lists and the scrape history live in data/plans, outside data/bronze:
+upload_adls ships and archives everything in the bronze folders, and its
+archive keeps only the last copy of each output. The planner folds every
+output it finds (current and archived) into its own history file.
+
+The history keeps, per UEN, the newest non-blank value of each field, when
+the UEN was last scraped and what ACRA said at that time. A gap or conflict
+is only planned again once ACRA changed or the scrape is RECHECK_DAYS old,
+so a page that simply lacks a field is not loaded every day.
+"""
+
+import glob
+import os
+from datetime import datetime
+
+import pandas as pd
+
+# ==================== CONFIG ====================
+ACRA_CSV = "data/bronze/acra/acra_data.csv"
+MAX_ROWS = 10000   # same slice of ACRA the scrapers look at
+PLAN_DIR = "data/plans"
+RECHECK_DAYS = int(os.getenv("PLANNER_RECHECK_DAYS", "30"))   # re-plan an unchanged gap/conflict after this
+
+# scraper column -> ACRA column (None = ACRA has no equivalent)
+SCRAPERS = {
+    "companies_sg": {
+        "outputs": "data/bronze/companies_sg/companies_sg_data.csv",
+        "worklist": f"{PLAN_DIR}/companies_sg_worklist.csv",
+        "history": f"{PLAN_DIR}/companies_sg_history.csv",
+        "key": "UEN",
+        "fields": {
+            "Entity Name": "entity_name",
+            "Registration Incorporation Date": "registration_incorporation_date",
+            "Company Type Description": "company_type_description",
+            "Entity Status Description": "entity_status_description",
+            "Entity Type Description": "entity_type_description",
+        },
+        "date_fields": ["Registration Incorporation Date"],
+    },
+    "recordowl": {
+        "outputs": "data/bronze/recordowld/websites_recordowl_*.csv",   # one file per run
+        "worklist": f"{PLAN_DIR}/recordowl_worklist.csv",
+        "history": f"{PLAN_DIR}/recordowl_history.csv",
+        "key": "uen",
+        "fields": {
+            "primary_ssic_code": "primary_ssic_code",
+            "secondary_ssic_code": "secondary_ssic_code",
+            "website": None,
+            "contact_number": None,
+            "description": None,
+        },
+        "date_fields": [],
+    },
+}
+# =================================================
+
+BLANK_VALUES = {"", "na", "n/a", "-", "nan", "none"}
+
+
+def is_blank(series):
+    """True where a value is missing or one of the ACRA placeholder strings"""
+    return series.isna() | series.astype(str).str.strip().str.lower().isin(BLANK_VALUES)
+
+
+def normalize(series, is_date=False):
+    """Normalize values so ACRA and scraped text can be compared"""
+    if is_date:
+        return pd.to_datetime(series, errors="coerce").dt.strftime("%Y-%m-%d")
+    return (series.astype(str)
+            .str.lower()
+            .str.replace(r"[^\w\s]", " ", regex=True)
+            .str.replace(r"\s+", " ", regex=True)
+            .str.strip())
+
+
+def load_acra(path=ACRA_CSV, max_rows=MAX_ROWS):
+    df = pd.read_csv(path, dtype=str, keep_default_na=False, nrows=max_rows)
+    df["uen"] = df["uen"].str.strip().str.upper()
+    return df[df["uen"] != ""].drop_duplicates(subset=["uen"])
+
+
+def fields_with_acra(config):
+    """Scraper fields that have an ACRA column to compare with"""
+    return {field: acra_col for field, acra_col in config["fields"].items() if acra_col is not None}
+
+
+def acra_column(field):
+    """History column holding the ACRA value of a mapped field at the time of the last scrape"""
+    return f"acra__{field}"
+
+
+def parse_times(series):
+    return pd.to_datetime(series, format="ISO8601", errors="coerce")
+
+
+def previous_outputs(config):
+    """Scraper outputs archived by upload_adls, then the ones still waiting in data/bronze (oldest first)"""
+    folder, pattern = os.path.split(config["outputs"])
+    paths = []
+    for directory in [os.path.join(folder, "archive"), folder]:
+        paths += sorted(glob.glob(os.path.join(directory, pattern)), key=os.path.getmtime)
+    return paths
+
+
+def read_output(path, config):
+    """
+    Scraped rows of one output file with their scrape time.
+    Rows without any mapped field (failed page loads) are dropped, so they are retried.
+    """
+    prev = pd.read_csv(path, dtype=str, keep_default_na=False)
+    prev = prev.rename(columns={config["key"]: "uen"})
+    prev["uen"] = prev["uen"].str.strip().str.upper()
+
+    # RecordOwl rows carry no time of their own: the file is written at the end of the run
+    written = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds")
+    if "scraped_at" not in prev.columns:
+        prev["scraped_at"] = written
+    prev["scraped_at"] = prev["scraped_at"].where(~is_blank(prev["scraped_at"]), written)
+
+    fields = [c for c in config["fields"] if c in prev.columns]
+    if not fields:
+        return prev.iloc[0:0][["uen", "scraped_at"]]
+    failed = pd.concat([is_blank(prev[c]) for c in fields], axis=1).all(axis=1)
+    return prev.loc[~failed, ["uen", "scraped_at"] + fields]
+
+
+def load_previous(config, acra):
+    """
+    Scraped fields of every run so far keyed by upper-case UEN, or None on the first run.
+
+    Per field the newest non-blank value wins, so a later failed or partial scrape
+    cannot erase a good value. A UEN whose scrape time moved records the current
+    ACRA values next to it. The history file is updated with the outputs found,
+    so it survives the uploader moving (and overwriting) them in archive/.
+    """
+    fields = list(config["fields"])
+    mapped = {field: acra_col for field, acra_col in fields_with_acra(config).items() if acra_col in acra.columns}
+
+    history = None
+    if os.path.exists(config["history"]):
+        history = pd.read_csv(config["history"], dtype=str, keep_default_na=False)
+    frames = [] if history is None else [history]
+    frames += [read_output(path, config) for path in previous_outputs(config)]
+    if not frames:
+        return None
+
+    rows = pd.concat(frames, ignore_index=True)
+    for column in ["scraped_at"] + fields:
+        if column not in rows.columns:
+            rows[column] = pd.NA
+    rows["_at"] = parse_times(rows["scraped_at"])
+    rows = rows.sort_values("_at", na_position="first", kind="stable").drop(columns="_at")   # old history first
+    scraped_cols = ["scraped_at"] + fields
+    rows[scraped_cols] = rows[scraped_cols].mask(
+        pd.concat([is_blank(rows[c]) for c in scraped_cols], axis=1)
+    )
+    prev = rows.groupby("uen", sort=False).last().reset_index()
+
+    # ACRA at the time of the scrape: refreshed for every UEN scraped since the last fold
+    before = pd.Series(dtype=str)
+    if history is not None and "scraped_at" in history.columns:
+        before = history.set_index("uen")["scraped_at"]
+    rescraped = prev["scraped_at"].fillna("") != prev["uen"].map(before).fillna("")
+    acra_by_uen = acra.set_index("uen")
+    for field, acra_col in mapped.items():
+        column = acra_column(field)
+        current = prev["uen"].map(acra_by_uen[acra_col])
+        prev[column] = current.where(rescraped, prev[column] if column in prev.columns else current)
+
+    prev = prev[["uen"] + scraped_cols + [acra_column(f) for f in mapped]].fillna("")
+    os.makedirs(os.path.dirname(config["history"]), exist_ok=True)
+    prev.to_csv(config["history"], index=False)
+    return prev
+
+
+def plan_source(acra, config):
+    """
+    Returns the ACRA rows that need a page load, with the reason.
+
+    A UEN is planned when
+    - it was never scraped and the scraper has a field ACRA lacks, or
+    - a mapped field is blank in ACRA and we have no scraped value, or
+    - ACRA and the previous scrape disagree on a mapped field (conflict)
+
+    A gap or conflict of a UEN scraped before is only planned again when the ACRA value
+    changed since that scrape, or when the scrape is older than RECHECK_DAYS.
+    """
+    fields = config["fields"]
+    prev = load_previous(config, acra)
+
+    if prev is None:
+        merged = acra.copy()
+        scraped = pd.Series(False, index=merged.index)
+        expired = pd.Series(True, index=merged.index)
+    else:
+        merged = acra.merge(prev, on="uen", how="left", suffixes=("", "__scraped"), indicator=True)
+        scraped = merged["_merge"] == "both"
+        scraped_at = parse_times(merged["scraped_at"])
+        expired = scraped_at.isna() | (scraped_at < pd.Timestamp.now() - pd.Timedelta(days=RECHECK_DAYS))
+
+    reasons = pd.Series("", index=merged.index)
+
+    def add_reason(mask, reason):
+        reasons.loc[mask] = reasons.loc[mask] + reason + ";"
+
+    has_unmapped = any(acra_col is None for acra_col in fields.values())
+    if has_unmapped:
+        add_reason(~scraped, "never_scraped")
+
+    for field, acra_col in fields.items():
+        if acra_col is None or acra_col not in merged.columns:
+            continue
+
+        if f"{field}__scraped" in merged.columns:
+            scraped_col = f"{field}__scraped"
+        elif field in merged.columns and field != acra_col:
+            scraped_col = field
+        else:
+            scraped_col = None
+
+        acra_blank = is_blank(merged[acra_col])
+        if scraped_col is None:
+            add_reason(acra_blank, f"gap:{field}")
+            continue
+
+        is_date = field in config["date_fields"]
+        acra_norm = normalize(merged[acra_col], is_date)
+
+        # Nothing new to learn from the same page until ACRA moves or the scrape gets old
+        recheck = ~scraped | expired
+        if acra_column(field) in merged.columns:
+            seen = merged[acra_column(field)]
+            seen_blank = is_blank(seen)
+            acra_changed = (acra_blank != seen_blank) | (
+                ~acra_blank & ~seen_blank & (acra_norm.fillna("") != normalize(seen, is_date).fillna(""))
+            )
+            recheck |= acra_changed
+
+        scraped_blank = is_blank(merged[scraped_col])
+        add_reason(acra_blank & scraped_blank & recheck, f"gap:{field}")
+
+        scraped_norm = normalize(merged[scraped_col], is_date)
+        conflict = (scraped & ~acra_blank & ~scraped_blank & recheck &
+                    acra_norm.notna() & scraped_norm.notna() & (acra_norm != scraped_norm))
+        add_reason(conflict, f"conflict:{field}")
+
+    planned = merged.loc[reasons != "", acra.columns].copy()
+    planned["plan_reason"] = reasons[reasons != ""].str.rstrip(";")
+    return planned
+
+
+def main():
+    print("=" * 60)
+    print("🧭 SCRAPE PLANNER")
+    print("=" * 60)
+
+    acra = load_acra()
+    print(f"✅ Loaded {len(acra):,} ACRA companies from {ACRA_CSV}\n")
+
+    total_avoided = 0
+    for source, config in SCRAPERS.items():
+        planned = plan_source(acra, config)
+
+        os.makedirs(os.path.dirname(config["worklist"]), exist_ok=True)
+        planned.to_csv(config["worklist"], index=False)
+
+        avoided = len(acra) - len(planned)
+        total_avoided += avoided
+
+        print(f"📋 {source}")
+        print(f"   Candidates: {len(acra):,}")
+        print(f"   Planned page loads: {len(planned):,}")
+        print(f"   Page loads avoided: {avoided:,} ({avoided / max(len(acra), 1) * 100:.1f}%)")
+        if len(planned):
+            top = planned["plan_reason"].str.split(";").explode().value_counts().head(5)
+            for reason, cnt in top.items():
+                print(f"     - {reason}: {cnt:,}")
+        print(f"   Work list: {config['worklist']}\n")
+
+    print(f"🎯 Total page loads avoided: {total_avoided:,}")
+
+
+if __name__ == "__main__":
+    main()
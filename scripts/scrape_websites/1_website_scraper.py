@@ -5,6 +5,7 @@ Production Selenium Scraper - FULL VERSION
 - Runs on all 1000 companies
 - Headless=False (visible browser helps bypass CAPTCHA)
 - Checkpoint saves every 100 companies
+- Stage telemetry (page-load/parse latency, errors, RSS, Chrome count) via common.telemetry
 """
 
 import pandas as pd
@@ -20,13 +21,32 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 import json
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.bronze_writer import write_bronze
+from common.telemetry import StageTelemetry
+
+
+def standardize_url(url):
+    """Normalize a URL the same way standardize_url does in the silver cleaning notebook"""
+    if url is None or pd.isna(url):
+        return ''
+    url = str(url).strip().lower()
+    url = re.sub(r'^https?://', '', url)
+    url = re.sub(r'^www\.', '', url)
+    url = re.sub(r'/$', '', url)
+    return url
+
 
 class ProductionSeleniumScraper:
     def __init__(self, 
                  html_dir='data/bronze/scrape_websites/html',
                  failed_dir='data/bronze/scrape_websites/website_not_working',
-                 checkpoint_dir='data/bronze/scrape_websites/checkpoint'):
+                 checkpoint_dir='data/bronze/scrape_websites/checkpoint',
+                 telemetry=None):
         self.driver = None
+        self.tel = telemetry or StageTelemetry("websites")
         self.wait = None
         self.html_dir = html_dir
         self.failed_dir = failed_dir
@@ -195,14 +215,13 @@ class ProductionSeleniumScraper:
             result['website'] = url
         
         try:
-            # Navigate
-            self.driver.get(url)
-            
-            # Wait
-            try:
-                self.wait.until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-            except:
-                pass
+            # Navigate + wait
+            with self.tel.timer("page_load"):
+                self.driver.get(url)
+                try:
+                    self.wait.until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+                except:
+                    pass
             
             time.sleep(3)
             
@@ -231,9 +250,10 @@ class ProductionSeleniumScraper:
                 pass
             
             # Extract data
-            social = self.extract_social_media(html_content)
-            contact = self.extract_contact_info(html_content)
-            keywords = self.extract_keywords(html_content)
+            with self.tel.timer("parse"):
+                social = self.extract_social_media(html_content)
+                contact = self.extract_contact_info(html_content)
+                keywords = self.extract_keywords(html_content)
             
             result.update(social)
             result.update(contact)
@@ -241,6 +261,7 @@ class ProductionSeleniumScraper:
             result['scrape_status'] = 'success'
             
         except Exception as e:
+            self.tel.error(e)
             error_msg = str(e).lower()
             if 'timeout' in error_msg:
                 result['error'] = 'Timeout'
@@ -249,6 +270,24 @@ class ProductionSeleniumScraper:
         
         return result
     
+    def load_checkpoint(self, checkpoint_file, uens):
+        """
+        Successful rows of a checkpoint left by a crashed run, limited to the given UENs.
+        Failed rows are dropped so their websites are tried again.
+        """
+        if not os.path.exists(checkpoint_file):
+            return []
+        saved = pd.read_csv(checkpoint_file, dtype={'uen': str})
+        saved = saved[saved['uen'].str.strip().str.upper().isin(uens) & (saved['scrape_status'] == 'success')]
+        saved = saved.drop_duplicates('uen', keep='last')
+        return saved.astype(object).where(saved.notna(), None).to_dict('records')
+    
+    def save_checkpoint(self, results, checkpoint_file):
+        """Write via a temp name so a crash mid-write keeps the previous checkpoint"""
+        tmp_file = checkpoint_file + '.tmp'
+        pd.DataFrame(results).to_csv(tmp_file, index=False)
+        os.replace(tmp_file, checkpoint_file)
+    
     def run_full_scrape(self, input_file, output_file, start_from=0, max_companies=1000):
         """Run full scrape with checkpoints"""
         print("="*70)
@@ -259,7 +298,8 @@ class ProductionSeleniumScraper:
         print("  ✓ Visible browser (helps with CAPTCHA)")
         print("  ✓ Saves HTML to Bronze layer")
         print("  ✓ Extracts all available data")
-        print("  ✓ Checkpoint saves every 100 companies")
+        print("  ✓ Checkpoint saves every 100 websites")
+        print("  ✓ Fetches each shared website once per run")
         print("  ✓ Resume capability")
         print()
         
@@ -273,30 +313,47 @@ class ProductionSeleniumScraper:
         # Slice for processing
         df_to_process = df_with_websites.iloc[start_from:start_from + max_companies]
         
+        # Resume: UENs scraped successfully by a crashed run of this slice are carried over, not fetched again
+        checkpoint_file = os.path.join(self.checkpoint_dir, 'checkpoint.csv')
+        slice_uens = df_to_process['uen'].astype(str).str.strip().str.upper()
+        results = self.load_checkpoint(checkpoint_file, set(slice_uens))
+        resumed = len(results)
+        done_uens = {str(r['uen']).strip().upper() for r in results}
+        df_to_process = df_to_process[~slice_uens.isin(done_uens)]
+        
+        # Group companies sharing the same website so each URL is fetched once
+        df_to_process = df_to_process.assign(url_key=df_to_process['website'].map(standardize_url))
+        url_groups = list(df_to_process.groupby('url_key', sort=False))
+        
         print(f"Total companies in file: {len(df)}")
         print(f"Companies with websites: {len(df_with_websites)}")
-        print(f"Processing: {len(df_to_process)} companies")
         print(f"Starting from: {start_from}")
+        if resumed:
+            print(f"Resumed from checkpoint: {resumed} companies already scraped")
+        print(f"Processing: {len(df_to_process)} companies")
+        print(f"Unique websites: {len(url_groups)}")
         print()
         
-        input("Press ENTER to start (browser will open)...")
-        print()
+        if sys.stdin.isatty():      # no prompt when run by the scheduler
+            input("Press ENTER to start (browser will open)...")
+            print()
         
         # Setup browser
         self.setup_driver()
         
-        results = []
         failed_sites = []
         start_time = time.time()
         
-        for idx, (_, row) in enumerate(df_to_process.iterrows(), 1):
-            actual_idx = start_from + idx
-            uen = row['uen']
-            company_name = row['company_name']
-            website = row['website']
+        for idx, (url_key, group) in enumerate(url_groups, 1):
+            first = group.iloc[0]
+            uen = first['uen']
+            company_name = first['company_name']
+            website = first['website']
             
-            print(f"[{idx}/{len(df_to_process)}] {company_name}")
+            print(f"[{idx}/{len(url_groups)}] {company_name}")
             print(f"  URL: {website}")
+            if len(group) > 1:
+                print(f"  Shared by {len(group)} companies")
             
             scrape_start = time.time()
             
@@ -305,17 +362,26 @@ class ProductionSeleniumScraper:
             
             scrape_time = time.time() - scrape_start
             result['scrape_time'] = round(scrape_time, 1)
+            self.tel.item()
             
-            results.append(result)
-            
-            # Track failures
-            if result['scrape_status'] == 'failed':
-                failed_sites.append({
-                    'uen': uen,
-                    'company_name': company_name,
-                    'website': website,
-                    'error': result['error']
-                })
+            # Fan the extracted fields out to every UEN referencing this website
+            for _, row in group.iterrows():
+                row_result = dict(result)
+                row_result['uen'] = row['uen']
+                row_result['company_name'] = row['company_name']
+                row_result['website'] = row['website']
+                if row['uen'] != uen:
+                    row_result['html_saved'] = False
+                results.append(row_result)
+                
+                # Track failures
+                if row_result['scrape_status'] == 'failed':
+                    failed_sites.append({
+                        'uen': row['uen'],
+                        'company_name': row['company_name'],
+                        'website': row['website'],
+                        'error': row_result['error']
+                    })
             
             # Print
             if result['scrape_status'] == 'success':
@@ -336,21 +402,20 @@ class ProductionSeleniumScraper:
             if idx % 10 == 0:
                 elapsed = time.time() - start_time
                 avg_time = elapsed / idx
-                remaining = (len(df_to_process) - idx) * avg_time
+                remaining = (len(url_groups) - idx) * avg_time
                 
-                success = len([r for r in results if r['scrape_status'] == 'success'])
+                success = len([r for r in results[resumed:] if r['scrape_status'] == 'success'])
                 
                 print()
-                print(f"  Progress: {idx}/{len(df_to_process)} ({idx/len(df_to_process)*100:.1f}%)")
-                print(f"  Success: {success}/{idx} ({success/idx*100:.1f}%)")
+                print(f"  Progress: {idx}/{len(url_groups)} websites ({idx/len(url_groups)*100:.1f}%)")
+                print(f"  Success: {success}/{len(results) - resumed} companies ({success/(len(results) - resumed)*100:.1f}%)")
                 print(f"  Time: {elapsed/60:.1f}m | Remaining: {remaining/60:.0f}m")
                 print()
             
             # Checkpoint every 100
             if idx % 100 == 0:
-                checkpoint_file = os.path.join(self.checkpoint_dir, f'checkpoint_{actual_idx}.csv')
-                pd.DataFrame(results).to_csv(checkpoint_file, index=False)
-                print(f"  💾 Checkpoint saved: {actual_idx} companies")
+                self.save_checkpoint(results, checkpoint_file)
+                print(f"  💾 Checkpoint saved: {len(results)} companies (a restart skips the UENs in it)")
                 print()
             
             time.sleep(1)
@@ -360,7 +425,9 @@ class ProductionSeleniumScraper:
         
         # Save final results
         results_df = pd.DataFrame(results)
-        results_df.to_csv(output_file, index=False)
+        write_bronze(results_df, "scrape_websites", output_file)
+        if os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)     # the output holds every row now; the next run starts fresh
         
         # Save failed
         if failed_sites:
@@ -372,6 +439,7 @@ class ProductionSeleniumScraper:
         # Summary
         total_time = time.time() - start_time
         success_count = len([r for r in results if r['scrape_status'] == 'success'])
+        self.tel.set(companies=len(results), success=success_count)
         
         print()
         print("="*70)
@@ -382,6 +450,9 @@ class ProductionSeleniumScraper:
         print()
         print("SUMMARY:")
         print(f"  Total processed: {len(results)}")
+        print(f"  Resumed from checkpoint: {resumed}")
+        print(f"  Websites fetched: {len(url_groups)}")
+        print(f"  Saved fetches: {len(results) - resumed - len(url_groups)} (websites shared across UENs)")
         print(f"  ✅ Success: {success_count} ({success_count/len(results)*100:.1f}%)")
         print(f"  ❌ Failed: {len(results) - success_count}")
         print()
@@ -404,10 +475,11 @@ if __name__ == "__main__":
     OUTPUT_FILE = 'data/bronze/scraped_websites.csv'
     os.makedirs('data/bronze/scrape_websites', exist_ok=True)
     # Configuration
-    START_FROM = 0  # Set to checkpoint number to resume
+    START_FROM = 0  # First row of the slice; a crashed run of the same slice resumes from its checkpoint
     MAX_COMPANIES = 1000  # Process all
     
-    scraper = ProductionSeleniumScraper()
-    scraper.run_full_scrape(INPUT_FILE, OUTPUT_FILE, START_FROM, MAX_COMPANIES)
+    with StageTelemetry("websites") as tel:
+        scraper = ProductionSeleniumScraper(telemetry=tel)
+        scraper.run_full_scrape(INPUT_FILE, OUTPUT_FILE, START_FROM, MAX_COMPANIES)
     
     print("✅ DONE! Check the output CSV for your dataset.")
\ No newline at end of file
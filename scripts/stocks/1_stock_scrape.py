@@ -6,6 +6,8 @@ Requirements:
     pip install selenium
     - Chrome browser installed
     - ChromeDriver will be auto-downloaded by Selenium
+
+Stage telemetry (page-load latency, errors, RSS, Chrome count) via common.telemetry
 """
 
 from selenium import webdriver
@@ -16,6 +18,11 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.telemetry import StageTelemetry
 
 def setup_driver(headless=False):
     """Setup Chrome driver with options"""
@@ -49,12 +56,13 @@ def save_html(html_content, filename="sgx_stocks.html"):
     print(f"✓ File size: {len(html_content):,} characters")
     return filename
 
-def get_sgx_stocks_page(url, wait_time=7):
+def get_sgx_stocks_page(url, tel, wait_time=7):
     """
     Fetch SGX stocks page with Selenium
     
     Args:
         url: SGX page URL
+        tel: StageTelemetry of the run
         wait_time: Seconds to wait for dynamic content
     """
     driver = setup_driver(headless=False)  # Set True to run in background
@@ -64,13 +72,14 @@ def get_sgx_stocks_page(url, wait_time=7):
         print(f"Accessing: {url}")
         print(f"{'='*60}\n")
         
-        driver.get(url)
-        print("✓ Page loaded")
-        
-        # Wait for body
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        with tel.timer("page_load"):
+            driver.get(url)
+            print("✓ Page loaded")
+            
+            # Wait for body
+            WebDriverWait(driver, 20).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
         
         # Additional wait for JavaScript to load
         print(f"⏳ Waiting {wait_time}s for dynamic content...")
@@ -127,6 +136,7 @@ def get_sgx_stocks_page(url, wait_time=7):
         return html_content, filename
         
     except Exception as e:
+        tel.error(e)
         print(f"\n✗ ERROR: {e}")
         import traceback
         traceback.print_exc()
@@ -137,7 +147,7 @@ def get_sgx_stocks_page(url, wait_time=7):
         driver.quit()
         print("✓ Browser closed")
 
-def main():
+def main(tel):
     """Main execution"""
     
     # Correct SGX stock listing URL
@@ -152,9 +162,10 @@ def main():
     print(f"# Fetching Singapore Exchange Stock List")
     print(f"{'#'*60}")
     
-    html, filename = get_sgx_stocks_page(url, wait_time=7)
+    html, filename = get_sgx_stocks_page(url, tel, wait_time=7)
     
     if html and len(html) > 10000:  # Reasonable page size
+        tel.item()
         print(f"\n{'='*60}")
         print("SUCCESS!")
         print(f"{'='*60}")
@@ -166,6 +177,7 @@ def main():
         print("3. We'll build the extraction logic")
         return html, filename
     else:
+        tel.mark_failed()
         print(f"\n✗ Failed to fetch content from: {url}")
         print("\nPossible issues:")
         print("- Page requires JavaScript execution")
@@ -174,7 +186,8 @@ def main():
         return None, None
 
 if __name__ == "__main__":
-    html, filename = main()
+    with StageTelemetry("stocks_selenium") as tel:
+        html, filename = main(tel)
     
     if html:
         print("\n\n" + "="*60)
@@ -2,18 +2,21 @@
 Extract Stock Data from SGX HTML
 Extracts symbol, company name, market cap, stock price, %change, and revenue
 from the saved sgx_stocks.html file
+Numeric columns are parsed to floats ('1.23B' -> 1230000000.0)
 """
 
-from bs4 import BeautifulSoup
 import pandas as pd
-import re
 import os
+import sys
+from pathlib import Path
 
-def clean_text(text):
-    """Clean text by removing extra whitespace"""
-    if text:
-        return ' '.join(text.strip().split())
-    return ''
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.html_parsing import parse_stock_table
+from common.bronze_writer import write_bronze
+from common.numeric import parse_numeric_columns
+from snapshot_store import append_snapshot
+
+NUMERIC_COLUMNS = ["market_cap", "stock_price", "percent_change", "revenue"]
 
 def extract_stocks_from_html(html_file):
     """
@@ -35,78 +38,18 @@ def extract_stocks_from_html(html_file):
     
     print(f"✓ File size: {len(html_content):,} characters\n")
     
-    # Parse with BeautifulSoup
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find the main table
-    table = soup.find('table', {'id': 'main-table'})
+    # Parse with lxml (single pass over #main-table rows)
+    stocks_data = parse_stock_table(html_content)
     
-    if not table:
+    if stocks_data is None:
         print("✗ Could not find main-table")
         return None
     
-    print("✓ Found main stock table\n")
-    
-    # Extract data
-    stocks_data = []
-    tbody = table.find('tbody')
-    
-    if not tbody:
-        print("✗ Could not find tbody")
-        return None
+    print(f"✓ Found main stock table with {len(stocks_data)} stocks\n")
     
-    rows = tbody.find_all('tr')
-    print(f"Found {len(rows)} table rows\n")
-    
-    for idx, row in enumerate(rows, 1):
-        try:
-            cells = row.find_all('td')
-            
-            if len(cells) < 7:
-                continue
-            
-            # Extract data from each cell
-            # Structure: No, Symbol, Company Name, Market Cap, Stock Price, % Change, Revenue
-            
-            # Symbol (cell 1)
-            symbol_cell = cells[1]
-            symbol_link = symbol_cell.find('a')
-            symbol = clean_text(symbol_link.text) if symbol_link else clean_text(symbol_cell.text)
-            
-            # Company Name (cell 2)
-            company_name = clean_text(cells[2].text)
-            
-            # Market Cap (cell 3)
-            market_cap = clean_text(cells[3].text)
-            
-            # Stock Price (cell 4)
-            stock_price = clean_text(cells[4].text)
-            
-            # % Change (cell 5)
-            percent_change = clean_text(cells[5].text)
-            
-            # Revenue (cell 6)
-            revenue = clean_text(cells[6].text)
-            
-            stocks_data.append({
-                'symbol': symbol,
-                'company_name': company_name,
-                'market_cap': market_cap,
-                'stock_price': stock_price,
-                'percent_change': percent_change,
-                'revenue': revenue
-            })
-            
-            # Progress indicator
-            if idx % 100 == 0:
-                print(f"Processed {idx} stocks...")
-                
-        except Exception as e:
-            print(f"✗ Error processing row {idx}: {e}")
-            continue
-    
-    # Create DataFrame
+    # Create DataFrame with typed numeric columns
     df = pd.DataFrame(stocks_data)
+    df = parse_numeric_columns(df, NUMERIC_COLUMNS)
     
     print(f"\n{'='*60}")
     print("EXTRACTION COMPLETE")
@@ -117,10 +60,10 @@ def extract_stocks_from_html(html_file):
     return df
 
 def save_to_csv(df, output_file):
-    """Save DataFrame to CSV"""
-    df.to_csv(output_file, index=False, encoding='utf-8')
-    print(f"\n✓ Saved to: {output_file}")
-    print(f"✓ File size: {os.path.getsize(output_file):,} bytes")
+    """Save DataFrame as bronze Parquet (+ CSV side output)"""
+    parquet_file = write_bronze(df, "stocks", output_file)
+    print(f"\n✓ Saved to: {parquet_file}")
+    print(f"✓ File size: {os.path.getsize(parquet_file):,} bytes")
 
 def display_sample(df, n=10):
     """Display sample of the data"""
@@ -164,8 +107,9 @@ def main():
     # Display sample
     display_sample(df)
     
-    # Save to CSV
+    # Save to CSV + dated snapshot
     save_to_csv(df, output_csv)
+    append_snapshot(df)
     
     print(f"\n{'='*60}")
     print("SUCCESS!")
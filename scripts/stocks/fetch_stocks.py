@@ -0,0 +1,280 @@
+"""
+SGX Stock Listing Fetcher - HTTP VERSION (no browser)
+- Fetches the listing's structured data (SvelteKit __data.json) over HTTP
+- Writes typed rows straight to bronze Parquet (+ sgx_stocks_extracted.csv)
+- Appends every fetch to the dated snapshot store (snapshot_store.py)
+- Falls back to the server-rendered HTML table, then to the Selenium
+  scripts (1_stock_scrape.py + 2_extract_stocks.py) if both fail
+- Stage telemetry (fetch/parse latency, errors, RSS) via common.telemetry
+"""
+
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from common.html_parsing import parse_stock_table
+from common.bronze_writer import parquet_path_for, write_bronze
+from common.numeric import parse_numeric, parse_numeric_columns
+from common.telemetry import StageTelemetry
+from snapshot_store import append_snapshot
+
+# ==================== CONFIG ====================
+LIST_URL = "https://stockanalysis.com/list/singapore-exchange/"
+DATA_URL = LIST_URL + "__data.json"
+OUTPUT_CSV = "data/bronze/stocks/sgx_stocks_extracted.csv"
+RAW_JSON = "data/bronze/stocks/html/sgx_stocks_data.json"
+TIMEOUT = 15
+RETRIES = 3
+MIN_ROWS = 100          # ⬅️ fewer rows than this means the payload changed shape
+USE_SELENIUM_FALLBACK = True
+# =================================================
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/html;q=0.9, */*;q=0.8",
+}
+
+COLUMNS = ["symbol", "company_name", "market_cap", "stock_price", "percent_change", "revenue"]
+NUMERIC_COLUMNS = ["market_cap", "stock_price", "percent_change", "revenue"]
+
+# payload key -> output column
+FIELD_ALIASES = {
+    "symbol": ("s", "symbol"),
+    "company_name": ("n", "name", "companyName"),
+    "market_cap": ("marketCap", "mc"),
+    "stock_price": ("price", "p"),
+    "percent_change": ("change", "ch"),
+    "revenue": ("revenue", "rev"),
+}
+
+# devalue reserved indices
+_UNDEFINED, _HOLE, _NAN, _POS_INF, _NEG_INF, _NEG_ZERO = -1, -2, -3, -4, -5, -6
+_SPECIAL = {_UNDEFINED: None, _HOLE: None, _NAN: math.nan,
+            _POS_INF: math.inf, _NEG_INF: -math.inf, _NEG_ZERO: -0.0}
+
+
+def http_get(session, url):
+    """GET with simple exponential backoff"""
+    for attempt in range(1, RETRIES + 1):
+        try:
+            response = session.get(url, headers=HEADERS, timeout=TIMEOUT)
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            if attempt == RETRIES:
+                raise
+            print(f"⚠️ {url} failed ({e}), retry {attempt}/{RETRIES - 1}")
+            time.sleep(2 ** attempt)
+
+
+def unflatten(values):
+    """
+    Decode a devalue-flattened array (the format SvelteKit uses in __data.json).
+
+    values[0] is the root; every other int is an index into values, except the
+    negative reserved ones. Arrays starting with a string are typed values
+    (Date, Set, Map, ...).
+    """
+    hydrated = {}
+
+    def hydrate(index):
+        if index in _SPECIAL:
+            return _SPECIAL[index]
+        if index in hydrated:
+            return hydrated[index]
+
+        value = values[index]
+        if isinstance(value, dict):
+            obj = hydrated[index] = {}
+            for key, child in value.items():
+                obj[key] = hydrate(child)
+            return obj
+
+        if isinstance(value, list):
+            if value and isinstance(value[0], str):
+                kind = value[0]
+                if kind in ("Date", "RegExp", "BigInt"):
+                    result = int(value[1]) if kind == "BigInt" else value[1]
+                elif kind == "Set":
+                    result = [hydrate(v) for v in value[1:]]
+                elif kind == "Map":
+                    result = {hydrate(value[i]): hydrate(value[i + 1])
+                              for i in range(1, len(value), 2)}
+                elif kind == "null":
+                    result = {value[i]: hydrate(value[i + 1]) for i in range(1, len(value), 2)}
+                else:
+                    result = None
+                hydrated[index] = result
+                return result
+            arr = hydrated[index] = []
+            arr.extend(hydrate(v) for v in value)
+            return arr
+
+        hydrated[index] = value
+        return value
+
+    return hydrate(0)
+
+
+def decode_sveltekit_data(payload):
+    """Hydrate every data node of a SvelteKit __data.json response"""
+    nodes = []
+    for node in payload.get("nodes") or []:
+        if node and node.get("type") == "data" and node.get("data"):
+            nodes.append(unflatten(node["data"]))
+    return nodes
+
+
+def find_stock_rows(obj):
+    """Largest list of dicts that carry a symbol key, anywhere in obj"""
+    best = []
+    stack = [obj]
+    seen = set()
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+
+        if isinstance(current, dict):
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            dicts = [v for v in current if isinstance(v, dict)]
+            if dicts and len(dicts) > len(best) and any(
+                    k in dicts[0] for k in FIELD_ALIASES["symbol"]):
+                best = dicts
+            stack.extend(current)
+    return best
+
+
+def to_number(value):
+    """Payload numbers are already typed; display strings go through parse_numeric"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) or math.isinf(value) else float(value)
+    return parse_numeric(value)
+
+
+def normalize_row(raw):
+    """Map one payload record onto the extracted-CSV columns"""
+    row = {}
+    for column, aliases in FIELD_ALIASES.items():
+        row[column] = next((raw[k] for k in aliases if k in raw), None)
+
+    symbol = str(row["symbol"] or "").strip()
+    row["symbol"] = symbol.split("/")[-1].upper()  # "sgx/D05" -> "D05"
+    row["company_name"] = " ".join(str(row["company_name"] or "").split())
+    for column in NUMERIC_COLUMNS:
+        row[column] = to_number(row[column])
+    return row
+
+
+def fetch_from_data_endpoint(session, tel):
+    """Primary path: one JSON request for the whole listing"""
+    with tel.timer("page_load"):
+        response = http_get(session, DATA_URL)
+    payload = response.json()
+
+    os.makedirs(os.path.dirname(RAW_JSON), exist_ok=True)
+    with open(RAW_JSON, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+
+    with tel.timer("parse"):
+        rows = []
+        for node in decode_sveltekit_data(payload):
+            rows = find_stock_rows(node)
+            if rows:
+                break
+        return [normalize_row(r) for r in rows]
+
+
+def fetch_from_html(session, tel):
+    """Second path: server-rendered #main-table, no JavaScript needed"""
+    with tel.timer("page_load"):
+        response = http_get(session, LIST_URL)
+    with tel.timer("parse"):
+        stocks = parse_stock_table(response.text)
+    return stocks or []
+
+
+def run_selenium_fallback():
+    """Last resort: the original browser scrape + HTML extraction"""
+    script_dir = Path(__file__).parent
+    parquet_path = parquet_path_for(OUTPUT_CSV)
+    started = time.time()
+    for script in ["1_stock_scrape.py", "2_extract_stocks.py"]:
+        print(f"🌐 Falling back to {script}")
+        result = subprocess.run([sys.executable, str(script_dir / script)])
+        if result.returncode != 0:
+            return False
+    # A Parquet file left over from an earlier run is not a result of this fallback
+    return os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= started
+
+
+def write_rows(rows):
+    """Dedup by symbol and write the bronze Parquet (and CSV side output)"""
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    df = parse_numeric_columns(df, NUMERIC_COLUMNS)
+    df = df[df["symbol"].astype(str).str.len() > 0].drop_duplicates("symbol")
+    write_bronze(df, "stocks", OUTPUT_CSV)
+    return df
+
+
+def fetch_listing(tel):
+    """HTTP paths first, then the Selenium fallback; exits 1 if all fail"""
+    start = time.time()
+    session = requests.Session()
+
+    for name, fetch in [("data endpoint", fetch_from_data_endpoint),
+                        ("server-rendered HTML", fetch_from_html)]:
+        try:
+            rows = fetch(session, tel)
+        except (requests.RequestException, ValueError) as e:
+            tel.error(e)
+            print(f"⚠️ {name} failed: {e}")
+            continue
+
+        if len(rows) < MIN_ROWS:
+            tel.error("TooFewRows")
+            print(f"⚠️ {name} returned only {len(rows)} rows")
+            continue
+
+        df = write_rows(rows)
+        print(f"✅ {len(df)} stocks from {name} in {time.time() - start:.2f}s")
+        print(f"✅ Saved to: {OUTPUT_CSV}")
+        append_snapshot(df)
+        tel.set(source=name)
+        return df
+
+    if USE_SELENIUM_FALLBACK and run_selenium_fallback():
+        print(f"✅ Saved to: {parquet_path_for(OUTPUT_CSV)} (Selenium fallback)")
+        tel.set(source="selenium fallback")
+        return pd.read_parquet(parquet_path_for(OUTPUT_CSV))
+
+    print("❌ Could not fetch the SGX stock listing")
+    sys.exit(1)
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("SGX STOCK LISTING FETCHER (HTTP)")
+    print("=" * 60 + "\n")
+
+    with StageTelemetry("stocks") as tel:
+        df = fetch_listing(tel)
+        tel.item(len(df))
+    return df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+SGX Stock Snapshot Store
+- Every extraction is appended as a Parquet file under snapshot_date=YYYY-MM-DD/
+- Numeric columns are stored typed (float64), never as display strings
+- _latest.parquet maps each symbol to the file holding its newest snapshot,
+  so "latest per symbol" reads only those files
+- "Range for symbol" prunes partitions by date before reading anything
+
+Usage (from the project root):
+    python scripts/stocks/snapshot_store.py                  # summary
+    python scripts/stocks/snapshot_store.py latest
+    python scripts/stocks/snapshot_store.py range D05 2026-01-01 2026-03-31
+"""
+
+import os
+import sys
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# ==================== CONFIG ====================
+SNAPSHOT_DIR = "data/bronze/stocks/snapshots"
+LATEST_FILE = os.path.join(SNAPSHOT_DIR, "_latest.parquet")  # "_" keeps it out of the dataset
+COMPRESSION = "zstd"
+# =================================================
+
+SNAPSHOT_SCHEMA = pa.schema([
+    ("symbol", pa.string()),
+    ("company_name", pa.string()),
+    ("market_cap", pa.float64()),
+    ("stock_price", pa.float64()),
+    ("percent_change", pa.float64()),
+    ("revenue", pa.float64()),
+    ("snapshot_ts", pa.timestamp("s")),
+])
+
+LATEST_SCHEMA = pa.schema([
+    ("symbol", pa.string()),
+    ("snapshot_date", pa.string()),
+    ("snapshot_ts", pa.timestamp("s")),
+    ("file", pa.string()),
+])
+
+PARTITIONING = ds.partitioning(pa.schema([("snapshot_date", pa.string())]), flavor="hive")
+
+NUMERIC_COLUMNS = ["market_cap", "stock_price", "percent_change", "revenue"]
+
+
+def _write_atomic(table, path):
+    """
+    Write a Parquet file via a temp name so readers never see half a file.
+    The "." prefix keeps a temp file left by a crash out of the dataset (pyarrow skips it).
+    """
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    pq.write_table(table, tmp_path, compression=COMPRESSION)
+    os.replace(tmp_path, path)
+
+
+def _dataset():
+    return ds.dataset(SNAPSHOT_DIR, format="parquet", partitioning=PARTITIONING)
+
+
+def append_snapshot(df, when=None):
+    """
+    Append one extraction as a new file in today's partition.
+
+    df must already have typed numeric columns (floats or None).
+
+    Returns:
+        path of the written snapshot file
+    """
+    when = (when or datetime.now()).replace(microsecond=0)
+    snapshot_date = when.date().isoformat()
+
+    snap = df[[f.name for f in SNAPSHOT_SCHEMA if f.name != "snapshot_ts"]].copy()
+    snap = snap[snap["symbol"].notna()].drop_duplicates("symbol").sort_values("symbol")
+    for column in NUMERIC_COLUMNS:
+        if not pd.api.types.is_numeric_dtype(snap[column]):
+            raise TypeError(f"{column} must be numeric, got {snap[column].dtype}")
+    snap["snapshot_ts"] = pd.Timestamp(when)
+
+    partition_dir = os.path.join(SNAPSHOT_DIR, f"snapshot_date={snapshot_date}")
+    os.makedirs(partition_dir, exist_ok=True)
+    # uuid suffix: two appends within the same second must not overwrite each other
+    file_path = os.path.join(partition_dir, f"part-{when.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet")
+
+    table = pa.Table.from_pandas(snap, schema=SNAPSHOT_SCHEMA, preserve_index=False)
+    _write_atomic(table, file_path)
+
+    _update_latest(snap["symbol"].tolist(), snapshot_date, when, file_path)
+    print(f"📸 Snapshot: {len(snap)} stocks → {file_path}")
+    return file_path
+
+
+def _read_latest():
+    if not os.path.exists(LATEST_FILE):
+        return pd.DataFrame(columns=LATEST_SCHEMA.names)
+    return pq.read_table(LATEST_FILE).to_pandas()
+
+
+def _update_latest(symbols, snapshot_date, when, file_path):
+    """Point every symbol of the new snapshot at the new file"""
+    latest = _read_latest()
+    latest = latest[~latest["symbol"].isin(symbols)]
+    new = pd.DataFrame({
+        "symbol": symbols,
+        "snapshot_date": snapshot_date,
+        "snapshot_ts": pd.Timestamp(when),
+        "file": os.path.relpath(file_path, SNAPSHOT_DIR),
+    })
+    latest = pd.concat([latest, new], ignore_index=True).sort_values("symbol")
+    _write_atomic(pa.Table.from_pandas(latest, schema=LATEST_SCHEMA, preserve_index=False), LATEST_FILE)
+
+
+def rebuild_latest():
+    """
+    Recreate _latest.parquet from the partitions (only needed if it was lost).
+    Snapshots with the same timestamp are decided by file name, so rebuilds agree.
+    """
+    dataset = _dataset()
+    latest = {}
+    for fragment in dataset.get_fragments():
+        snapshot_date = ds.get_partition_keys(fragment.partition_expression)["snapshot_date"]
+        file = os.path.relpath(fragment.path, SNAPSHOT_DIR)
+        table = fragment.to_table(columns=["symbol", "snapshot_ts"])
+        for symbol, ts in zip(table["symbol"].to_pylist(), table["snapshot_ts"].to_pylist()):
+            if symbol not in latest or (ts, file) > latest[symbol][1:]:
+                latest[symbol] = (snapshot_date, ts, file)
+
+    df = pd.DataFrame(
+        [(s, d, ts, f) for s, (d, ts, f) in latest.items()],
+        columns=LATEST_SCHEMA.names,
+    ).sort_values("symbol")
+    _write_atomic(pa.Table.from_pandas(df, schema=LATEST_SCHEMA, preserve_index=False), LATEST_FILE)
+    return df
+
+
+def latest_per_symbol(symbols=None):
+    """
+    Newest snapshot row for every symbol (or only the given symbols).
+
+    Only the files referenced by _latest.parquet are opened.
+    """
+    if not os.path.exists(LATEST_FILE):
+        rebuild_latest()
+    pointer = _read_latest()
+    if symbols is not None:
+        pointer = pointer[pointer["symbol"].isin(symbols)]
+
+    frames = []
+    for file, group in pointer.groupby("file"):
+        table = pq.read_table(
+            os.path.join(SNAPSHOT_DIR, file),
+            filters=[("symbol", "in", group["symbol"].tolist())],
+        )
+        part = table.to_pandas()
+        part["snapshot_date"] = group["snapshot_date"].iloc[0]
+        frames.append(part)
+
+    if not frames:
+        return pd.DataFrame(columns=SNAPSHOT_SCHEMA.names + ["snapshot_date"])
+    return pd.concat(frames, ignore_index=True).sort_values("symbol").reset_index(drop=True)
+
+
+def symbol_range(symbol, start=None, end=None):
+    """
+    All snapshots of one symbol between start and end (ISO dates, inclusive).
+
+    The date filter prunes snapshot_date= directories before any file is read.
+    """
+    expr = ds.field("symbol") == symbol
+    if start:
+        expr &= ds.field("snapshot_date") >= start
+    if end:
+        expr &= ds.field("snapshot_date") <= end
+
+    table = _dataset().to_table(filter=expr)
+    return table.to_pandas().sort_values("snapshot_ts").reset_index(drop=True)
+
+
+def main():
+    if not os.path.exists(SNAPSHOT_DIR):
+        print(f"✗ No snapshots yet in {SNAPSHOT_DIR}")
+        return
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "summary"
+
+    if command == "latest":
+        print(latest_per_symbol().to_string())
+    elif command == "range":
+        symbol = sys.argv[2]
+        start = sys.argv[3] if len(sys.argv) > 3 else None
+        end = sys.argv[4] if len(sys.argv) > 4 else None
+        print(symbol_range(symbol, start, end).to_string())
+    else:
+        dates = sorted(d.split("=", 1)[1] for d in os.listdir(SNAPSHOT_DIR) if d.startswith("snapshot_date="))
+        pointer = _read_latest()
+        print(f"📅 Partitions: {len(dates)} ({dates[0] if dates else '-'} → {dates[-1] if dates else '-'})")
+        print(f"📈 Symbols in latest pointer: {len(pointer)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,144 @@
 import os
 import glob
 import shutil
+import time
 from dotenv import load_dotenv
-from azure.storage.filedatalake import DataLakeServiceClient
-from datetime import datetime
+
+from common.adls_upload import AdlsBackend, LocalBackend, UploadEngine
+from common.telemetry import StageTelemetry
+from common.upload_manifest import UploadManifest, file_sha256
 
 # Load .env file
 load_dotenv()
 
 ACCOUNT_NAME = os.getenv("ADLS_ACCOUNT_NAME")
 ACCOUNT_KEY = os.getenv("ADLS_ACCOUNT_KEY")
-
-
-def upload_to_adls(local_path, remote_path, file_system):
-    """Upload a single file to ADLS Gen2"""
-
-    service_client = DataLakeServiceClient(
-        account_url=f"https://{ACCOUNT_NAME}.dfs.core.windows.net",
-        credential=ACCOUNT_KEY
+ACCOUNT_URL = os.getenv("ADLS_ACCOUNT_URL") or f"https://{ACCOUNT_NAME}.dfs.core.windows.net"
+
+# ==================== CONFIG ====================
+UPLOAD_BACKEND = os.getenv("UPLOAD_BACKEND", "adls")      # adls | local
+LOCAL_UPLOAD_ROOT = os.getenv("LOCAL_UPLOAD_ROOT", "data/_adls_local")
+BLOCK_SIZE_MB = int(os.getenv("UPLOAD_BLOCK_SIZE_MB", "4"))
+BLOCK_WORKERS = int(os.getenv("UPLOAD_BLOCK_WORKERS", "4"))
+FILE_WORKERS = int(os.getenv("UPLOAD_FILE_WORKERS", "4"))
+MANIFEST_PATH = f"data/_upload_manifest_{UPLOAD_BACKEND}.sqlite"  # per backend, so dry runs never hide real uploads
+
+SOURCES = ["acra", "companies_sg", "recordowld", "scrape_websites", "stocks"]
+FILE_SYSTEM = "bronze"
+# =================================================
+
+
+def build_engine():
+    """One backend (one client + connection pool) shared by every upload"""
+    if UPLOAD_BACKEND == "local":
+        backend = LocalBackend(LOCAL_UPLOAD_ROOT)
+    else:
+        backend = AdlsBackend(ACCOUNT_URL, ACCOUNT_KEY, pool_size=FILE_WORKERS * BLOCK_WORKERS)
+    return UploadEngine(
+        backend,
+        block_size=BLOCK_SIZE_MB * 1024 * 1024,
+        block_workers=BLOCK_WORKERS,
+        file_workers=FILE_WORKERS,
     )
 
-    fs_client = service_client.get_file_system_client(file_system)
-    file_client = fs_client.get_file_client(remote_path)
 
-    with open(local_path, "rb") as f:
-        file_client.upload_data(f.read(), overwrite=True)
-
-    print(f"✅ Uploaded: {local_path} → {remote_path}")
-
-
-def process_and_archive(src, file_system):
-    """
-    Upload all CSV files from data/{src}
-    Then move them to data/{src}/archive
+def collect_jobs(src, file_system):
     """
+    Bronze files in data/{file_system}/{src} as upload jobs.
 
+    Typed Parquet is shipped; a CSV is only shipped when it has no Parquet
+    sibling (its CSV side output is archived together with the Parquet).
+    """
     base_path = f"data/{file_system}/{src}"
-    archive_path = f"{base_path}/archive"
-
-    # Create archive folder if not exists
-    os.makedirs(archive_path, exist_ok=True)
-
-    # Get all CSV files
-    csv_files = glob.glob(os.path.join(base_path, "*.csv"))
+    parquet_files = glob.glob(os.path.join(base_path, "*.parquet"))
+    csv_files = [p for p in glob.glob(os.path.join(base_path, "*.csv"))
+                 if not os.path.exists(os.path.splitext(p)[0] + ".parquet")]
+    return [(path, file_system, f"{src}/{os.path.basename(path)}")
+            for path in parquet_files + csv_files]
 
-    if not csv_files:
-        print("No CSV files found.")
-        return
 
-    for file_path in csv_files:
-        file_name = os.path.basename(file_path)
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        # ADLS upload path
-        remote_path = f"{src}/{file_name}"
+def archive(local_path):
+    """Move an uploaded file (and its CSV side output) to the archive folder next to it"""
+    archive_path = os.path.join(os.path.dirname(local_path), "archive")
+    os.makedirs(archive_path, exist_ok=True)
 
-        # ✅ Upload the file
-        upload_to_adls(
-            local_path=file_path,
-            remote_path=remote_path,
-            file_system=file_system
-        )
+    paths = [local_path]
+    side_output = os.path.splitext(local_path)[0] + ".csv"
+    if local_path.endswith(".parquet") and os.path.exists(side_output):
+        paths.append(side_output)
 
-        # ✅ Move file to archive
-        dest_path = os.path.join(archive_path, file_name)
-        shutil.move(file_path, dest_path)
+    for path in paths:
+        dest_path = os.path.join(archive_path, os.path.basename(path))
+        shutil.move(path, dest_path)
         print(f"📦 Moved to archive: {dest_path}")
 
-    print("✅ All files processed and archived successfully.")
 
-process_and_archive(src="acra", file_system="bronze")
-process_and_archive(src="companies_sg", file_system="bronze")
-process_and_archive(src="recordowld", file_system="bronze")
-process_and_archive(src="scrape_websites", file_system="bronze")
-process_and_archive(src="stocks", file_system="bronze")
+def process_and_archive(sources=SOURCES, file_system=FILE_SYSTEM):
+    """
+    Upload all bronze files from data/{file_system}/{src} for every source in parallel
+    Then move the uploaded ones to data/{file_system}/{src}/archive
 
+    Files whose content the manifest already has at the same remote path are
+    not uploaded again, only archived (e.g. after a crash before the move).
+    """
+    jobs = [job for src in sources for job in collect_jobs(src, file_system)]
+    if not jobs:
+        print("No bronze files found.")
+        return []
+
+    manifest = UploadManifest(MANIFEST_PATH)
+    fingerprints = {}
+    to_upload, already_remote = [], []
+    for job in jobs:
+        local_path, fs, remote_path = job
+        size, sha256 = os.path.getsize(local_path), file_sha256(local_path)
+        fingerprints[local_path] = (size, sha256)
+        if manifest.is_uploaded(fs, remote_path, size, sha256):
+            already_remote.append(job)
+        else:
+            to_upload.append(job)
+
+    for local_path, fs, remote_path in already_remote:
+        print(f"⏭️  Already uploaded (same SHA-256): {local_path} → {remote_path}")
+        archive(local_path)
+
+    def record(job):
+        local_path, fs, remote_path = job
+        manifest.record(fs, remote_path, local_path, *fingerprints[local_path])
+
+    results = []
+    if to_upload:
+        print(f"🚀 Uploading {len(to_upload)} files ({UPLOAD_BACKEND}, "
+              f"{FILE_WORKERS} files x {BLOCK_WORKERS} blocks of {BLOCK_SIZE_MB} MiB)")
+        start = time.time()
+        results = build_engine().upload_many(to_upload, on_uploaded=record)
+        elapsed = time.time() - start
+
+        for result in results:
+            if result["ok"]:
+                archive(result["local_path"])
+
+        uploaded = [r for r in results if r["ok"]]
+        total_bytes = sum(r["bytes"] for r in uploaded)
+        print(f"✅ {len(uploaded)}/{len(results)} files uploaded, {total_bytes / 1e6:.1f} MB "
+              f"in {elapsed:.1f}s ({total_bytes / 1e6 / max(elapsed, 1e-9):.1f} MB/s)")
+        failed = [r for r in results if not r["ok"]]
+        if failed:
+            print(f"❌ {len(failed)} files failed and were left in place for the next run")
+
+    print(f"⏭️  Skipped {len(already_remote)} files already in ADLS")
+    manifest.close()
+    return results
+
+if __name__ == "__main__":
+    with StageTelemetry("upload_adls") as tel:
+        results = process_and_archive()
+        for result in results:
+            tel.observe("upload", result["seconds"])
+            if result["ok"]:
+                tel.item()
+            else:
+                tel.error(result["error_class"])
+        tel.set(bytes=sum(r["bytes"] for r in results), backend=UPLOAD_BACKEND)
+    if any(not r["ok"] for r in results):
+        raise SystemExit(1)